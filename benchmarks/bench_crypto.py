@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解密微基准：对比逐页 aes_decrypt 旧路径与 CryptoEngine 的单页开销。
+
+运行：
+    python benchmarks/bench_crypto.py --pages 200 --items 50
+输出一段 JSON，单位为每页微秒。
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Crypto.Cipher import AES  # type: ignore[import-untyped]  # noqa: E402
+from Crypto.Util.Padding import unpad  # type: ignore[import-untyped]  # noqa: E402
+
+from maomi_spider import KEY_BYTES, CryptoEngine, aes_encrypt, derive_iv  # noqa: E402
+
+SUFFIXES = ("654321", "123456", "888888")
+
+
+def synthetic_items(page: int, items: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": page * 1000 + idx,
+            "title": f"示例标题 {page}-{idx}",
+            "description": "示例描述" * 8,
+            "tags": "猫咪推荐,每日更新",
+            "duration": 600 + idx,
+            "insert_time": 1700000000,
+            "update_time": 1700000000 + idx,
+            "video_url": f"/hls/{page}/{idx}/index.m3u8",
+            "down_url": f"/mp4/{page}/{idx}.mp4",
+            "thumb": f"/thumb/{page}/{idx}.jpg",
+            "preview": f"/preview/{page}/{idx}.mp4",
+        }
+        for idx in range(items)
+    ]
+
+
+def synthetic_page(page: int, items: int, last_page: int = 100) -> str:
+    data = synthetic_items(page, items) if page <= last_page else []
+    return json.dumps({"list": {"data": data, "last_page": last_page}}, ensure_ascii=False)
+
+
+def legacy_decrypt(cipher_b64: str, suffix: str) -> Any:
+    # 优化前的路径：每页重新派生 IV、解码 Base64、分配明文并解码为 str
+    iv = derive_iv.__wrapped__(suffix)
+    cipher = AES.new(KEY_BYTES, AES.MODE_CBC, iv)
+    plain = unpad(cipher.decrypt(base64.b64decode(cipher_b64)), AES.block_size).decode("utf-8")
+    return json.loads(plain)
+
+
+def time_per_page(fn: Callable[[str, str], Any], payloads: List[Tuple[str, str]], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for cipher_b64, suffix in payloads:
+            fn(cipher_b64, suffix)
+        best = min(best, time.perf_counter() - start)
+    return best / len(payloads) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AES 解密微基准")
+    parser.add_argument("--pages", type=int, default=200, help="模拟页数")
+    parser.add_argument("--items", type=int, default=50, help="每页条数")
+    parser.add_argument("--rounds", type=int, default=5, help="重复轮数，取最好成绩")
+    parser.add_argument("--processes", type=int, default=0, help="decrypt_many 的进程数（0 表示不测）")
+    args = parser.parse_args()
+
+    payloads = [
+        (aes_encrypt(synthetic_page(page, args.items), SUFFIXES[page % len(SUFFIXES)]), SUFFIXES[page % len(SUFFIXES)])
+        for page in range(args.pages)
+    ]
+    engine = CryptoEngine()
+    result: Dict[str, Any] = {
+        "pages": args.pages,
+        "items_per_page": args.items,
+        "payload_bytes": sum(len(cipher_b64) for cipher_b64, _ in payloads) // len(payloads),
+        "legacy_decrypt_parse_us": round(time_per_page(legacy_decrypt, payloads, args.rounds), 1),
+        "engine_decrypt_parse_us": round(
+            time_per_page(lambda c, s: json.loads(engine.decrypt(c, s)), payloads, args.rounds), 1
+        ),
+        "legacy_decrypt_only_us": round(
+            time_per_page(
+                lambda c, s: unpad(
+                    AES.new(KEY_BYTES, AES.MODE_CBC, derive_iv.__wrapped__(s)).decrypt(base64.b64decode(c)),
+                    AES.block_size,
+                ),
+                payloads,
+                args.rounds,
+            ),
+            1,
+        ),
+        "engine_decrypt_only_us": round(time_per_page(engine.decrypt, payloads, args.rounds), 1),
+    }
+    if args.processes > 1:
+        start = time.perf_counter()
+        engine.decrypt_many(payloads, processes=args.processes)
+        result["decrypt_many_us"] = round((time.perf_counter() - start) / len(payloads) * 1e6, 1)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
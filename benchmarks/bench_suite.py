@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离线基准套件：在本地桩服务上测量登录、分类解析、单页解密+解析+格式化与端到端批量采集，
+无需真实账号与外网。
+
+运行：
+    python benchmarks/bench_suite.py --pages 20 --items 50 --output bench.json
+    python benchmarks/bench_suite.py --baseline bench.json   # 与上次结果对比
+
+输出 JSON：meta 记录环境与参数，metrics 为各项指标（*_us / *_ms 为每次耗时取最好成绩，越小越好；
+*_per_s 为吞吐，越大越好）；指定 --baseline 时附带 vs_baseline（相对变化百分比，正数表示变好）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import maomi_spider  # noqa: E402
+from maomi_spider import (  # noqa: E402
+    JSON_BACKEND,
+    MaomiClient,
+    Video,
+    decrypt_payload,
+    is_supported,
+    json_loads,
+    parse_categories,
+)
+
+from stub_server import FixtureSpec, StubServer, point_client_at  # noqa: E402
+
+
+def best_of(fn: Callable[[], Any], rounds: int, repeat: int = 1) -> float:
+    """执行 rounds 轮、每轮 repeat 次，返回单次耗时的最好成绩（秒）。"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(spec: FixtureSpec, concurrency: int, rounds: int, latency: float) -> Dict[str, float]:
+    metrics: Dict[str, float] = {}
+    with StubServer(spec=spec, latency=latency) as server:
+        point_client_at(server.base_url)
+        category_envelope = server.category_body
+        list_envelope = server.list_bodies[1]
+
+        client = MaomiClient("bench", "bench", concurrency=concurrency)
+        metrics["login_ms"] = best_of(lambda: client.login(force=True), rounds, 20) * 1e3
+
+        metrics["category_parse_us"] = (
+            best_of(lambda: parse_categories(decrypt_payload(json_loads(category_envelope))), rounds, 200) * 1e6
+        )
+        metrics["category_fetch_ms"] = best_of(client.fetch_catalog, rounds, 20) * 1e3
+
+        def decode_page() -> None:
+            listing = decrypt_payload(json_loads(list_envelope)).get("list") or {}
+            for item in listing.get("data") or []:
+                Video.from_item(item).to_dict()
+
+        metrics["page_decrypt_parse_format_us"] = best_of(decode_page, rounds, 100) * 1e6
+        metrics["page_fetch_ms"] = best_of(lambda: client._fetch_list_page("vip", "bench0", 1), rounds, 20) * 1e3
+
+        targets = [cat for cat in client.fetch_categories(refresh=True) if is_supported(cat)]
+        crawl_seconds = float("inf")
+        videos = 0
+        for _ in range(rounds):
+            start = time.perf_counter()
+            results = client.crawl_categories(targets, spec.pages)
+            crawl_seconds = min(crawl_seconds, time.perf_counter() - start)
+            videos = sum(len(result.videos) for result in results)
+            errors = [result.error for result in results if result.error]
+            if errors:
+                raise RuntimeError(f"采集失败：{errors[0]}")
+        requests_per_crawl = spec.categories * spec.pages + spec.topics
+        metrics["crawl_s"] = crawl_seconds
+        metrics["crawl_pages_per_s"] = requests_per_crawl / crawl_seconds
+        metrics["crawl_videos_per_s"] = videos / crawl_seconds
+        metrics["crawl_videos"] = videos
+    return {name: round(value, 3) for name, value in metrics.items()}
+
+
+def compare(metrics: Dict[str, float], baseline: Dict[str, float]) -> Dict[str, float]:
+    changes: Dict[str, float] = {}
+    for name, value in metrics.items():
+        old = baseline.get(name)
+        if not old or not value or name == "crawl_videos":
+            continue
+        # 耗时类指标越小越好，吞吐类越大越好；统一成“正数 = 变好”
+        ratio = value / old if name.endswith("_per_s") else old / value
+        changes[name] = round((ratio - 1) * 100, 1) + 0.0  # 避免输出 -0.0
+    return changes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="猫咪 SDK 离线基准套件")
+    parser.add_argument("--categories", type=int, default=FixtureSpec.categories, help="列表分类数")
+    parser.add_argument("--pages", type=int, default=FixtureSpec.pages, help="每个分类的页数")
+    parser.add_argument("--items", type=int, default=FixtureSpec.items, help="每页条数")
+    parser.add_argument("--topics", type=int, default=FixtureSpec.topics, help="专题数")
+    parser.add_argument("--topic-items", type=int, default=FixtureSpec.topic_items, help="每个专题的视频数")
+    parser.add_argument("--concurrency", type=int, default=4, help="端到端采集的并发数")
+    parser.add_argument("--latency", type=float, default=0.0, help="桩服务每个响应的模拟往返延迟（秒）")
+    parser.add_argument("--rounds", type=int, default=3, help="每项重复轮数，取最好成绩")
+    parser.add_argument("--output", help="结果另存为 JSON 文件")
+    parser.add_argument("--baseline", help="与之前保存的结果文件对比")
+    args = parser.parse_args()
+
+    spec = FixtureSpec(args.categories, args.pages, args.items, args.topics, args.topic_items)
+    metrics = run_suite(spec, args.concurrency, args.rounds, args.latency)
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": int(time.time()),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "json_backend": JSON_BACKEND,
+            "requests_version": maomi_spider.requests.__version__,
+            "params": {**vars(spec), "concurrency": args.concurrency, "latency": args.latency, "rounds": args.rounds},
+        },
+        "metrics": metrics,
+    }
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            report["vs_baseline"] = compare(metrics, json.load(file).get("metrics") or {})
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
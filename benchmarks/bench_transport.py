@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+传输层基准：在本地桩服务上比较不同连接池 / keep-alive / 后端配置在各并发度下的吞吐。
+
+运行：
+    python benchmarks/bench_transport.py --requests 400 --concurrency 1,4,16,32 --latency 0.02
+输出一段 JSON，单位为每秒请求数（只计 HTTP 往返，不含解密）。--latency 让桩在每个响应前等待，
+模拟到线上 CDN 的往返时间；为 0 时本机 CPU 往往先成为瓶颈，看不出连接池差异。
+
+注意：桩服务为明文 HTTP/1.1，httpx 后端在这里同样走 HTTP/1.1；HTTP/2 只在 TLS 上经 ALPN 协商，
+本基准衡量的是该后端的连接池与调度开销。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from requests.adapters import HTTPAdapter  # noqa: E402
+
+from maomi_spider import MaomiClient, RetryPolicy, TransportConfig  # noqa: E402
+
+from stub_server import FixtureSpec, StubServer  # noqa: E402
+
+
+def legacy_client(concurrency: int) -> MaomiClient:
+    # 调优前的行为：requests 默认适配器，每个域名最多保留 10 条连接
+    client = MaomiClient("bench", "bench", concurrency=concurrency)
+    adapter = HTTPAdapter()
+    client.session.mount("http://", adapter)
+    client.session.mount("https://", adapter)
+    return client
+
+
+VARIANTS: Dict[str, Callable[[int], MaomiClient]] = {
+    "legacy_pool10": legacy_client,
+    "tuned_pool": lambda c: MaomiClient("bench", "bench", concurrency=c),
+    "no_keepalive": lambda c: MaomiClient("bench", "bench", concurrency=c, transport=TransportConfig(keepalive=False)),
+    "httpx_backend": lambda c: MaomiClient("bench", "bench", concurrency=c, transport=TransportConfig(http2=True)),
+}
+
+
+def requests_per_second(client: MaomiClient, urls: List[str], concurrency: int) -> float:
+    def fetch(url: str) -> None:
+        client._request("GET", url).raise_for_status()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(fetch, urls[: concurrency * 2]))  # 预热：建立连接
+        start = time.perf_counter()
+        list(pool.map(fetch, urls))
+        elapsed = time.perf_counter() - start
+    return len(urls) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTTP 传输层吞吐基准")
+    parser.add_argument("--requests", type=int, default=400, help="每组测量的请求数")
+    parser.add_argument("--concurrency", default="1,4,16,32", help="逗号分隔的并发度")
+    parser.add_argument("--items", type=int, default=50, help="每页条数（决定响应体大小）")
+    parser.add_argument("--latency", type=float, default=0.02, help="桩服务每个响应的模拟往返延迟（秒）")
+    parser.add_argument("--variants", default=",".join(VARIANTS), help=f"要测的配置，可选 {', '.join(VARIANTS)}")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    variants = [name.strip() for name in args.variants.split(",") if name.strip()]
+
+    with StubServer(spec=FixtureSpec(pages=20, items=args.items), latency=args.latency) as server:
+        urls = [server.list_url(idx % server.pages + 1) for idx in range(args.requests)]
+        result: Dict[str, Any] = {
+            "requests": args.requests,
+            "response_bytes": len(server.list_bodies[1]),
+            "latency_s": args.latency,
+            "cpu_count": os.cpu_count(),
+            "requests_per_second": {},
+        }
+        for name in variants:
+            row: Dict[str, float] = {}
+            for level in levels:
+                client = VARIANTS[name](level)
+                client.retry_policy = RetryPolicy(max_retries=0)
+                try:
+                    row[str(level)] = round(requests_per_second(client, urls, level), 1)
+                finally:
+                    client.session.close()
+            result["requests_per_second"][name] = row
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
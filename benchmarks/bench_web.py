@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Web 响应层基准：比较 Flask 默认 jsonify 与 FastJSONProvider 的序列化耗时，各编码的线上字节数与压缩耗时，
+以及首页 render_template_string 与预压缩 CachedBody 的单次开销。
+
+运行：
+    python benchmarks/bench_web.py --videos 1000,5000
+输出一段 JSON：*_us / *_ms 为单次耗时的最好成绩，*_bytes 为响应体字节数。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, render_template_string  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+import web_app  # noqa: E402
+from maomi_response import COMPRESS_MIN_BYTES, compress, supported_encodings  # noqa: E402
+from maomi_spider import JSON_BACKEND, Video, parse_categories  # noqa: E402
+
+from bench_crypto import synthetic_items  # noqa: E402
+from bench_suite import best_of  # noqa: E402
+from stub_server import FixtureSpec, catalog_document  # noqa: E402
+
+
+def scrape_payload(videos: int) -> Dict[str, Any]:
+    items = [item for page in range(1, videos // 50 + 2) for item in synthetic_items(page, 50)][:videos]
+    return {
+        "account": {"vip_level": 1, "is_vip": 1},
+        "category": {"name": "基准分类", "jump_name": "bench", "channel": "vip", "videos_found": videos},
+        "videos": [Video.from_item(item).to_dict() for item in items],
+    }
+
+
+def measure_payload(stock: Flask, fast: Flask, payload: Any, rounds: int, repeat: int) -> Dict[str, float]:
+    with stock.app_context():
+        stdlib_body = stock.json.response(payload).get_data()
+        stdlib_s = best_of(lambda: stock.json.response(payload).get_data(), rounds, repeat)
+    with fast.app_context():
+        fast_body = fast.json.response(payload).get_data()
+        fast_s = best_of(lambda: fast.json.response(payload).get_data(), rounds, repeat)
+    row = {
+        "serialize_jsonify_ms": stdlib_s * 1e3,
+        "serialize_fast_ms": fast_s * 1e3,
+        "jsonify_bytes": len(stdlib_body),
+        "identity_bytes": len(fast_body),
+    }
+    for encoding in supported_encodings():
+        row[f"{encoding}_bytes"] = len(compress(fast_body, encoding))
+        row[f"{encoding}_compress_ms"] = best_of(lambda: compress(fast_body, encoding), rounds, repeat) * 1e3
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Web 响应层基准")
+    parser.add_argument("--videos", default="1000,5000", help="逗号分隔的 /api/scrape 视频条数")
+    parser.add_argument("--categories", type=int, default=300, help="分类列表条数")
+    parser.add_argument("--rounds", type=int, default=5, help="每项重复轮数，取最好成绩")
+    args = parser.parse_args()
+
+    stock = Flask("stock")  # 默认 DefaultJSONProvider：标准库编码、sort_keys、ensure_ascii
+    stock.json = DefaultJSONProvider(stock)
+    fast = web_app.app
+
+    catalog = parse_categories(catalog_document(FixtureSpec(categories=args.categories, topics=0)))
+    categories: List[Dict[str, Any]] = json.loads(web_app.category_body(catalog).data)
+    report: Dict[str, Any] = {
+        "json_backend": JSON_BACKEND,
+        "encodings": list(supported_encodings()),
+        "compress_min_bytes": COMPRESS_MIN_BYTES,
+        "categories": measure_payload(stock, fast, categories, args.rounds, 50),
+    }
+    for count in (int(value) for value in args.videos.split(",") if value.strip()):
+        report[f"scrape_{count}"] = measure_payload(stock, fast, scrape_payload(count), args.rounds, 3)
+
+    with fast.test_request_context("/", headers={"Accept-Encoding": ", ".join(supported_encodings())}):
+        index: Dict[str, float] = {
+            "render_template_us": best_of(lambda: render_template_string(web_app.INDEX_HTML), args.rounds, 200) * 1e6,
+            "cached_body_us": best_of(web_app.INDEX_BODY.response, args.rounds, 200) * 1e6,
+            "identity_bytes": len(web_app.INDEX_BODY.data),
+        }
+        for encoding in supported_encodings():
+            index[f"{encoding}_bytes"] = len(web_app.INDEX_BODY.encoded(encoding))
+    with fast.test_request_context("/", headers={"If-None-Match": f'W/"{web_app.INDEX_BODY.etag}"'}):
+        response = web_app.INDEX_BODY.response()
+        index["not_modified_status"] = response.status_code
+        index["not_modified_bytes"] = len(response.get_data())
+    report["index"] = index
+
+    def rounded(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {key: rounded(item) for key, item in value.items()}
+        return round(value, 3) if isinstance(value, float) else value
+
+    print(json.dumps(rounded(report), ensure_ascii=False, indent=2))
+    web_app.JOBS.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离线基准用的本地桩服务：模拟 loginByUsername、category/base-2.js、列表页与专题详情，
+响应与线上相同地用 aes_encrypt + suffix 加密。
+
+- 数据规模由 FixtureSpec 控制（列表分类数、页数、每页条数、专题数与专题条数）。
+- 响应体在启动时预先加密好，请求时只做查表回放，尽量不让桩本身成为瓶颈。
+- fixtures_dir 指定时优先回放目录中的文件（相对路径与 URL 路径一致，如
+  data/list/base-vip-bench0-1.js），可放入抓包得到的真实密文；dump() 可把合成数据写成这种目录。
+- HTTP/1.1 keep-alive，线程模型（ThreadingHTTPServer）；latency 为每个响应前的固定等待，用来模拟网络往返。
+- point_client_at(base_url) 把 maomi_spider 的接口地址改到桩上。
+
+单独运行：
+    python benchmarks/stub_server.py --port 8765 --pages 20 --items 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import maomi_spider  # noqa: E402
+from maomi_spider import aes_encrypt  # noqa: E402
+
+from bench_crypto import SUFFIXES, synthetic_items, synthetic_page  # noqa: E402
+
+LOGIN_PATH = "/api/user/loginByUsername"
+CATEGORY_PATH = "/data/category/base-2.js"
+LIST_PATH = re.compile(r"^/data/list/base-[^-/]+-.+-(\d+)\.js$")
+TOPIC_PATH = re.compile(r"^/data/topic/details-(\d+)-0\.js$")
+CATEGORY_ETAG = '"stub-catalog-v1"'
+
+
+@dataclass
+class FixtureSpec:
+    categories: int = 4
+    pages: int = 20
+    items: int = 50
+    topics: int = 1
+    topic_items: int = 200
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # 默认 5，关闭 keep-alive 的高并发测量会挤爆 backlog
+
+
+def encrypted_body(plaintext: str, suffix: str) -> bytes:
+    return json.dumps({"data": aes_encrypt(plaintext, suffix), "suffix": suffix}).encode("utf-8")
+
+
+def catalog_document(spec: FixtureSpec) -> Dict[str, Any]:
+    entries = [{"name": f"基准分类{idx}", "jump_name": f"bench{idx}", "channel": "vip"} for idx in range(spec.categories)]
+    entries += [
+        {"name": f"基准专题{idx}", "jump_name": f"benchzt{idx}", "channel": "topic", "topic_id": idx}
+        for idx in range(1, spec.topics + 1)
+    ]
+    return {"menus": {"1": {"name": "视频", "data": entries}}}
+
+
+def topic_document(topic_id: int, items: int) -> Dict[str, Any]:
+    return {
+        "list": {
+            "title": f"基准专题{topic_id}",
+            "desc": "离线基准用的合成专题",
+            "price": 10,
+            "vip_price": 5,
+            "cover": f"/cover/{topic_id}.jpg",
+            "list": synthetic_items(100000 + topic_id, items),
+        }
+    }
+
+
+class StubServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        spec: Optional[FixtureSpec] = None,
+        latency: float = 0.0,
+        fixtures_dir: Optional[str] = None,
+    ) -> None:
+        self.spec = spec or FixtureSpec()
+        self.pages = self.spec.pages
+        self.latency = latency
+        self.fixtures_dir = fixtures_dir
+        self.hits = 0
+        login = json.dumps({"data": {"token": "stub-token", "vip_level": 1, "is_vip": 1}})
+        self.login_body = json.dumps({"code": 0, **json.loads(encrypted_body(login, SUFFIXES[0]))}).encode("utf-8")
+        self.category_body = encrypted_body(json.dumps(catalog_document(self.spec), ensure_ascii=False), SUFFIXES[1])
+        # 列表页内容与 jump_name 无关，各分类共用同一组密文；最后一项为超出 last_page 的空页
+        self.list_bodies = {
+            page: encrypted_body(synthetic_page(page, self.spec.items, self.spec.pages), SUFFIXES[page % len(SUFFIXES)])
+            for page in range(1, self.spec.pages + 2)
+        }
+        self.topic_bodies = {
+            topic_id: encrypted_body(
+                json.dumps(topic_document(topic_id, self.spec.topic_items), ensure_ascii=False), SUFFIXES[2]
+            )
+            for topic_id in range(1, self.spec.topics + 1)
+        }
+        self.httpd = _Server((host, port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def lookup(self, path: str) -> Optional[bytes]:
+        if self.fixtures_dir:
+            fixture = os.path.join(self.fixtures_dir, path.lstrip("/"))
+            if os.path.isfile(fixture):
+                with open(fixture, "rb") as file:
+                    return file.read()
+        if path == LOGIN_PATH:
+            return self.login_body
+        if path == CATEGORY_PATH:
+            return self.category_body
+        match = LIST_PATH.match(path)
+        if match:
+            return self.list_bodies.get(int(match.group(1)), self.list_bodies[self.spec.pages + 1])
+        match = TOPIC_PATH.match(path)
+        if match:
+            return self.topic_bodies.get(int(match.group(1)))
+        return None
+
+    def dump(self, directory: str) -> None:
+        """把合成数据按 URL 路径写入目录，之后可用 fixtures_dir 回放或替换成真实抓包。"""
+        files = {LOGIN_PATH: self.login_body, CATEGORY_PATH: self.category_body}
+        for idx in range(self.spec.categories):
+            for page in range(1, self.spec.pages + 1):
+                files[f"/data/list/base-vip-bench{idx}-{page}.js"] = self.list_bodies[page]
+        for topic_id, body in self.topic_bodies.items():
+            files[f"/data/topic/details-{topic_id}-0.js"] = body
+        for path, body in files.items():
+            target = os.path.join(directory, path.lstrip("/"))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as file:
+                file.write(body)
+
+    def _handler(self) -> Any:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # 头与正文分两次写出，否则会撞上客户端的延迟 ACK（约 40ms）
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def reply(self, body: bytes, status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+                server.hits += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if self.close_connection:
+                    self.send_header("Connection", "close")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self.reply(server.lookup(self.path.split("?", 1)[0]) or b"{}")
+
+            def do_GET(self) -> None:
+                path = self.path.split("?", 1)[0]
+                if path == CATEGORY_PATH and self.headers.get("If-None-Match") == CATEGORY_ETAG:
+                    self.reply(b"", 304, {"ETag": CATEGORY_ETAG})
+                    return
+                body = server.lookup(path)
+                if body is None:
+                    self.reply(b"{}", 404)
+                else:
+                    self.reply(body, headers={"ETag": CATEGORY_ETAG} if path == CATEGORY_PATH else None)
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="maomi-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def list_url(self, page: int) -> str:
+        return f"{self.base_url}/data/list/base-vip-bench0-{page}.js"
+
+
+def point_client_at(base_url: str) -> Dict[str, str]:
+    """把 maomi_spider 的接口地址指向 base_url，返回原值以便恢复。"""
+    names = ("LOGIN_URL", "CATEGORY_API", "LIST_API_TEMPLATE", "TOPIC_DETAILS_API")
+    previous = {name: getattr(maomi_spider, name) for name in names}
+    maomi_spider.LOGIN_URL = base_url + LOGIN_PATH
+    maomi_spider.CATEGORY_API = base_url + CATEGORY_PATH
+    maomi_spider.LIST_API_TEMPLATE = base_url + "/data/list/base-{channel}-{slug}-{page}.js"
+    maomi_spider.TOPIC_DETAILS_API = base_url + "/data/topic/details-{topic_id}-0.js"
+    return previous
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="猫咪接口本地桩服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--categories", type=int, default=FixtureSpec.categories, help="列表分类数")
+    parser.add_argument("--pages", type=int, default=FixtureSpec.pages, help="每个分类的页数（last_page）")
+    parser.add_argument("--items", type=int, default=FixtureSpec.items, help="每页条数")
+    parser.add_argument("--topics", type=int, default=FixtureSpec.topics, help="专题数")
+    parser.add_argument("--topic-items", type=int, default=FixtureSpec.topic_items, help="每个专题的视频数")
+    parser.add_argument("--latency", type=float, default=0.0, help="每个响应前等待的秒数")
+    parser.add_argument("--fixtures-dir", help="优先回放该目录中按 URL 路径存放的响应文件")
+    parser.add_argument("--dump", metavar="DIR", help="把合成数据写入目录后退出")
+    args = parser.parse_args()
+    spec = FixtureSpec(args.categories, args.pages, args.items, args.topics, args.topic_items)
+    server = StubServer(args.host, args.port, spec, args.latency, args.fixtures_dir)
+    if args.dump:
+        server.dump(args.dump)
+        server.httpd.server_close()
+        print(f"已写入 {args.dump}", file=sys.stderr)
+        return
+    print(f"桩服务已启动：{server.base_url}", file=sys.stderr)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
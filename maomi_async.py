@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+猫咪 VIP 异步 SDK
+
+- 与 MaomiClient 保持相同的 login / fetch_categories / fetch_videos_for_category 接口。
+- 基于 httpx.AsyncClient（连接池 + HTTP keep-alive），签名、加解密与字段格式化直接复用 maomi_spider。
+- 全局信号量限制同时在途的请求数，按域名限速，可在单进程内并发采集多个分类。
+- http2=True 时经 TLS ALPN 协商 HTTP/2（需 pip install "httpx[http2]"）。
+
+依赖：pip install httpx
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - 可选依赖
+    httpx = None  # type: ignore[assignment]
+
+import maomi_spider
+from maomi_spider import (
+    AUTH_REJECTED_STATUSES,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_SUFFIX,
+    SUPPORTED_CHANNELS,
+    TOKEN_TTL_SECONDS,
+    CachedToken,
+    Category,
+    HostCircuitBreaker,
+    LoginResult,
+    MaomiClient,
+    RetryPolicy,
+    TokenStore,
+    build_login_request,
+    decrypt_payload,
+    parse_categories,
+    parse_login_response,
+    token_expiry,
+    topic_meta,
+)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+
+class AsyncHostRateLimiter:
+    """HostRateLimiter 的协程版本：同一域名两次请求之间至少间隔 1/rate 秒。"""
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate 必须 > 0")
+        self.interval = 1.0 / rate
+        self._next_slot: Dict[str, float] = {}
+
+    async def acquire(self, url: str) -> None:
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class MaomiAsyncClient:
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        suffix: str = DEFAULT_SUFFIX,
+        token_store: Optional[TokenStore] = None,
+        token_ttl: float = TOKEN_TTL_SECONDS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limit: Optional[float] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        http2: bool = False,
+        breaker: Optional[HostCircuitBreaker] = None,
+    ):
+        if httpx is None:
+            raise RuntimeError("异步客户端需要 httpx，请先执行 pip install httpx")
+        self.username = username
+        self.password = password
+        self.suffix = suffix
+        self.token_store = token_store
+        self.token_ttl = token_ttl
+        self.token_from_cache = False
+        self.semaphore = semaphore or asyncio.Semaphore(max(1, max_concurrency))
+        self.rate_limiter = AsyncHostRateLimiter(rate_limit) if rate_limit else None
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or HostCircuitBreaker.from_policy(self.retry_policy)
+        self.session = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(self.retry_policy.read_timeout, connect=self.retry_policy.connect_timeout),
+        )
+
+    async def __aenter__(self) -> "MaomiAsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.session.aclose()
+
+    async def login(self, force: bool = False) -> LoginResult:
+        if not force and self.token_store is not None:
+            cached = self.token_store.load(self.username, self.password)
+            if cached:
+                self._apply_token(cached.token)
+                self.token_from_cache = True
+                return LoginResult(token=cached.token, raw=cached.raw)
+        body, headers = build_login_request(self.username, self.password, self.suffix)
+        resp = await self._request("POST", maomi_spider.LOGIN_URL, json=body, headers=headers)
+        resp.raise_for_status()
+        result = parse_login_response(resp.json())
+        self._apply_token(result.token)
+        self.token_from_cache = False
+        if self.token_store is not None:
+            entry = CachedToken(
+                token=result.token,
+                raw=result.raw,
+                expires_at=token_expiry(result.token, self.token_ttl),
+            )
+            self.token_store.save(self.username, self.password, entry)
+        return result
+
+    def _apply_token(self, token: str) -> None:
+        self.session.headers["Authorization"] = f"Bearer {token}"
+
+    async def _get_payload(self, url: str) -> Any:
+        resp = await self._send_get(url)
+        if resp.status_code in AUTH_REJECTED_STATUSES and self.token_from_cache:
+            if self.token_store is not None:
+                self.token_store.discard(self.username)
+            await self.login(force=True)
+            resp = await self._send_get(url)
+        resp.raise_for_status()
+        return decrypt_payload(resp.json())
+
+    async def _send_get(self, url: str) -> "httpx.Response":
+        return await self._request(
+            "GET",
+            url,
+            params={"nocache": int(time.time() * 1000)},
+            headers={"Referer": "https://www.a3k3c.com/"},
+        )
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        """与 MaomiClient._request 相同的限速、熔断与重试语义；退避等待期间不占用信号量。"""
+        policy = self.retry_policy
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            self.breaker.before(host)
+            try:
+                async with self.semaphore:
+                    if self.rate_limiter is not None:
+                        await self.rate_limiter.acquire(url)
+                    resp = await self.session.request(method, url, **kwargs)
+            except httpx.TransportError:
+                self.breaker.record_failure(host)
+                if attempt >= policy.max_retries:
+                    raise
+                delay = policy.backoff(attempt)
+            else:
+                if resp.status_code not in policy.retry_statuses:
+                    self.breaker.record_success(host)
+                    return resp
+                self.breaker.record_failure(host)
+                if attempt >= policy.max_retries:
+                    return resp
+                delay = policy.retry_after(resp.headers.get("Retry-After"))
+                if delay is None:
+                    delay = policy.backoff(attempt)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def fetch_categories(self) -> List[Category]:
+        return parse_categories(await self._get_payload(maomi_spider.CATEGORY_API))
+
+    async def fetch_videos_for_category(
+        self, category: Category, pages: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        if category.channel == "topic":
+            return await self._fetch_topic_videos(category, pages)
+        return await self._fetch_channel_videos(category.channel, category.slug, pages), None
+
+    async def _fetch_channel_videos(self, channel: str, slug: str, pages: int) -> List[Dict[str, Any]]:
+        channel_normalized = (channel or "").strip()
+        if channel_normalized not in SUPPORTED_CHANNELS:
+            raise ValueError(f"当前频道暂未开放采集，channel={channel_normalized}")
+        first = await self._fetch_list_page(channel_normalized, slug, 1)
+        page_items = first.get("data") or []
+        if not page_items:
+            return []
+        items = [self._format_video(item) for item in page_items]
+        last_page = min(pages, first.get("last_page") or 1)
+        listings = await asyncio.gather(
+            *(self._fetch_list_page(channel_normalized, slug, page) for page in range(2, last_page + 1))
+        )
+        for listing in listings:
+            page_items = listing.get("data") or []
+            if not page_items:
+                break
+            items.extend(self._format_video(item) for item in page_items)
+        return items
+
+    async def _fetch_list_page(self, channel: str, slug: str, page: int) -> Dict[str, Any]:
+        url = maomi_spider.LIST_API_TEMPLATE.format(channel=channel, slug=quote(slug, safe=""), page=page)
+        return (await self._get_payload(url)).get("list") or {}
+
+    async def _fetch_topic_videos(
+        self, category: Category, pages: int
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        if not category.topic_id:
+            raise ValueError(f"未检测到 {category.name} 的 topic_id，无法采集")
+        data = await self._get_payload(maomi_spider.TOPIC_DETAILS_API.format(topic_id=category.topic_id))
+        topic_info = data.get("list") or {}
+        raw_items = topic_info.get("list") or []
+        limit = min(len(raw_items), pages * DEFAULT_PAGE_SIZE)
+        videos = [self._format_video(item) for item in raw_items[:limit]]
+        return videos, topic_meta(topic_info)
+
+    # 字段格式化与同步客户端完全一致，直接复用
+    _format_video = MaomiClient._format_video
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+视频记录导出
+
+- 格式：jsonl / jsonl.gz / jsonl.zst、csv / csv.gz、parquet；列与 maomi_store.VIDEO_COLUMNS 一致。
+- 导出器逐批写入（CLI 每解密一页写一批），内存中只保留当前批次；parquet 攒够一个行组再写出。
+- parquet 列带类型：id / duration_seconds 为 int64，insert_time / update_time 为 UTC 时间戳，
+  tags 拆分为字典编码的字符串列表。
+- zstd 需 pip install zstandard，parquet 需 pip install pyarrow，未安装时给出提示。
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
+
+from maomi_spider import EXPORT_FORMATS, Video, json_dumps
+from maomi_store import VIDEO_COLUMNS, split_tags, tags_text
+
+EXPORT_CONTENT_TYPES = {
+    "jsonl": "application/x-ndjson",
+    "jsonl.gz": "application/gzip",
+    "jsonl.zst": "application/zstd",
+    "csv": "text/csv; charset=utf-8",
+    "csv.gz": "application/gzip",
+    "parquet": "application/vnd.apache.parquet",
+}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+PARQUET_ROW_GROUP_SIZE = 10000
+EXPORT_CHUNK_SIZE = 500
+
+ExportRecord = Union[Video, Dict[str, Any]]
+
+
+def _record_dict(video: ExportRecord) -> Dict[str, Any]:
+    return video.to_dict() if isinstance(video, Video) else video
+
+
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_epoch(value: Any) -> Optional[int]:
+    """接口的时间字段多为 Unix 秒，偶见 ISO 字符串；无法识别时为空。"""
+    seconds = _as_int(value)
+    if seconds is not None or not isinstance(value, str):
+        return seconds
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def compressed_writer(file: BinaryIO, compression: Optional[str]) -> BinaryIO:
+    """在 file 外包一层压缩流；关闭压缩流只写出尾部，不关闭 file。"""
+    if compression == "gz":
+        return gzip.GzipFile(fileobj=file, mode="wb", compresslevel=GZIP_LEVEL)  # type: ignore[return-value]
+    if compression == "zst":
+        try:
+            import zstandard  # type: ignore[import-not-found]
+        except ImportError:
+            raise RuntimeError("zstd 压缩需要 zstandard，请先执行 pip install zstandard") from None
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(file, closefd=False)
+    return file
+
+
+class VideoExporter(ABC):
+    """导出器基类：write() 写入一批视频并返回条数，close() 写出尾部但不关闭底层文件。"""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        self.rows = 0
+
+    @abstractmethod
+    def write(self, videos: Iterable[ExportRecord]) -> int:
+        ...
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "VideoExporter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class JsonlExporter(VideoExporter):
+    def __init__(self, file: BinaryIO, compression: Optional[str] = None) -> None:
+        super().__init__(file)
+        self._stream = compressed_writer(file, compression)
+
+    def write(self, videos: Iterable[ExportRecord]) -> int:
+        lines = [json_dumps(_record_dict(video)) for video in videos]
+        if not lines:
+            return 0
+        self._stream.write(b"\n".join(lines) + b"\n")
+        self.rows += len(lines)
+        return len(lines)
+
+    def close(self) -> None:
+        if self._stream is not self.file:
+            self._stream.close()
+        self.file.flush()
+
+
+class CsvExporter(VideoExporter):
+    def __init__(self, file: BinaryIO, compression: Optional[str] = None) -> None:
+        super().__init__(file)
+        self._stream = compressed_writer(file, compression)
+        self._text = io.TextIOWrapper(self._stream, encoding="utf-8", newline="")  # type: ignore[arg-type]
+        self._writer = csv.DictWriter(self._text, fieldnames=VIDEO_COLUMNS, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, videos: Iterable[ExportRecord]) -> int:
+        count = 0
+        for video in videos:
+            record = _record_dict(video)
+            tags = record.get("tags")
+            if tags is not None and not isinstance(tags, str):
+                # 列表形式的标签与 SQLite 中一样拼成逗号分隔的字符串
+                record = {**record, "tags": tags_text(tags)}
+            self._writer.writerow(record)
+            count += 1
+        self._text.flush()
+        self.rows += count
+        return count
+
+    def close(self) -> None:
+        self._text.flush()
+        self._text.detach()
+        if self._stream is not self.file:
+            self._stream.close()
+        self.file.flush()
+
+
+class ParquetExporter(VideoExporter):
+    def __init__(self, file: BinaryIO, row_group_size: int = PARQUET_ROW_GROUP_SIZE) -> None:
+        super().__init__(file)
+        try:
+            import pyarrow as pa  # type: ignore[import-not-found]
+            import pyarrow.parquet as pq  # type: ignore[import-not-found]
+        except ImportError:
+            raise RuntimeError("parquet 导出需要 pyarrow，请先执行 pip install pyarrow") from None
+        self._pa = pa
+        self.schema = parquet_schema(pa)
+        self.row_group_size = row_group_size
+        self._columns: Dict[str, List[Any]] = {name: [] for name in self.schema.names}
+        self._writer = pq.ParquetWriter(file, self.schema, compression="zstd")
+
+    def write(self, videos: Iterable[ExportRecord]) -> int:
+        count = 0
+        columns = self._columns
+        for video in videos:
+            record = _record_dict(video)
+            for name, values in columns.items():
+                value = record.get(name)
+                if name in ("id", "duration_seconds"):
+                    value = _as_int(value)
+                elif name in ("insert_time", "update_time"):
+                    value = _as_epoch(value)
+                elif name == "tags":
+                    value = split_tags(value)
+                values.append(value)
+            count += 1
+        self.rows += count
+        if len(columns["id"]) >= self.row_group_size:
+            self._flush()
+        return count
+
+    def _flush(self) -> None:
+        if not self._columns["id"]:
+            return
+        self._writer.write_table(self._pa.table(self._columns, schema=self.schema))
+        for values in self._columns.values():
+            values.clear()
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+        self.file.flush()
+
+
+def parquet_schema(pa: Any) -> Any:
+    types = {
+        "id": pa.int64(),
+        "duration_seconds": pa.int64(),
+        "insert_time": pa.timestamp("s", tz="UTC"),
+        "update_time": pa.timestamp("s", tz="UTC"),
+        "tags": pa.list_(pa.dictionary(pa.int32(), pa.string())),
+    }
+    return pa.schema([(name, types.get(name, pa.string())) for name in VIDEO_COLUMNS])
+
+
+def create_exporter(file: BinaryIO, fmt: str) -> VideoExporter:
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"不支持的导出格式：{fmt}（可选 {', '.join(EXPORT_FORMATS)}）")
+    kind, _, compression = fmt.partition(".")
+    if kind == "jsonl":
+        return JsonlExporter(file, compression or None)
+    if kind == "csv":
+        return CsvExporter(file, compression or None)
+    return ParquetExporter(file)
+
+
+@contextmanager
+def export_file(path: str, fmt: str) -> Iterator[VideoExporter]:
+    """打开 path 并返回导出器；正常结束或异常退出时都会写出尾部并关闭文件。"""
+    with open(path, "wb") as file:
+        exporter = create_exporter(file, fmt)
+        try:
+            yield exporter
+        finally:
+            exporter.close()
+
+
+class _ChunkSink(io.RawIOBase):
+    """只追加的内存缓冲，供流式响应按批取走已写出的字节。"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_export(videos: Iterable[ExportRecord], fmt: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """按 chunk_size 条一批导出并产出字节块，用于 HTTP 流式下载。"""
+    sink = _ChunkSink()
+    exporter = create_exporter(sink, fmt)  # type: ignore[arg-type]
+    batch: List[ExportRecord] = []
+    for video in videos:
+        batch.append(video)
+        if len(batch) >= chunk_size:
+            exporter.write(batch)
+            batch = []
+            data = sink.drain()
+            if data:
+                yield data
+    exporter.write(batch)
+    exporter.close()
+    yield sink.drain()
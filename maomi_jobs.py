@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+后台采集任务
+
+- JobManager 用固定大小的线程池执行采集，提交即返回任务 id，不占用 Web 请求线程。
+- 相同键（分类 + 页数）的任务在排队 / 运行中或完成后的 TTL 内只执行一次，后来的提交直接复用。
+- 任务逐页追加结果，运行中即可分页读取已采到的部分；过期任务在下次访问时惰性清理。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from maomi_spider import Video, VideoPage
+
+DEFAULT_JOB_WORKERS = 2
+JOB_RESULT_TTL = 1800.0
+MAX_FINISHED_JOBS = 200
+MAX_PAGE_LIMIT = 1000
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_ERROR = "error"
+
+
+def clamp_window(offset: int, limit: int) -> Tuple[int, int]:
+    return max(0, offset), max(0, min(limit, MAX_PAGE_LIMIT))
+
+
+@dataclass
+class Job:
+    id: str
+    key: Hashable
+    info: Dict[str, Any]
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    pages_done: int = 0
+    pages_total: Optional[int] = None
+    videos: List[Video] = field(default_factory=list)
+    topic_meta: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_ERROR)
+
+    def add_page(self, page: VideoPage, pages_requested: int) -> None:
+        with self._lock:
+            self.videos.extend(page.videos)
+            self.pages_done += 1
+            self.pages_total = min(pages_requested, page.last_page)
+            if page.topic_meta is not None:
+                self.topic_meta = page.topic_meta
+
+    def window(self, offset: int = 0, limit: int = 100) -> Tuple[int, List[Video]]:
+        """(当前已采到的条数, videos[offset:offset+limit])，limit 上限 MAX_PAGE_LIMIT。"""
+        offset, limit = clamp_window(offset, limit)
+        with self._lock:
+            return len(self.videos), self.videos[offset : offset + limit]
+
+    def video_at(self, index: int) -> Optional[Video]:
+        with self._lock:
+            return self.videos[index] if 0 <= index < len(self.videos) else None
+
+    def snapshot(self, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """任务状态与 videos[offset:offset+limit]；运行中返回已采到的部分。"""
+        offset, limit = clamp_window(offset, limit)
+        with self._lock:
+            window = self.videos[offset : offset + limit]
+            total = len(self.videos)
+            return {
+                "id": self.id,
+                "status": self.status,
+                "category": self.info,
+                "progress": {"pages_done": self.pages_done, "pages_total": self.pages_total},
+                "videos_found": total,
+                "topic_meta": self.topic_meta,
+                "error": self.error,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "offset": offset,
+                "limit": limit,
+                "videos": [video.to_dict() for video in window],
+            }
+
+
+class JobManager:
+    def __init__(
+        self,
+        workers: int = DEFAULT_JOB_WORKERS,
+        ttl: float = JOB_RESULT_TTL,
+        max_finished: int = MAX_FINISHED_JOBS,
+    ) -> None:
+        self.ttl = ttl
+        self.max_finished = max_finished
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="maomi-job")
+        self._jobs: Dict[str, Job] = {}
+        self._by_key: Dict[Hashable, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: Hashable, run: Callable[[Job], None], info: Dict[str, Any]) -> Tuple[Job, bool]:
+        """提交任务；同键任务仍在进行或结果未过期时返回已有任务，第二个返回值为是否新建。"""
+        with self._lock:
+            self._purge()
+            existing = self._jobs.get(self._by_key.get(key, ""))
+            if existing is not None and existing.status != JOB_ERROR:
+                return existing, False
+            job = Job(id=uuid.uuid4().hex, key=key, info=info)
+            self._jobs[job.id] = job
+            self._by_key[key] = job.id
+        self._pool.submit(self._execute, job, run)
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._purge()
+            return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _execute(self, job: Job, run: Callable[[Job], None]) -> None:
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        try:
+            run(job)
+        except Exception as exc:  # noqa: BLE001 - 失败记录到任务上，由轮询方读取
+            job.error = str(exc)
+            job.status = JOB_ERROR
+        else:
+            job.status = JOB_DONE
+        finally:
+            job.finished_at = time.time()
+
+    def _purge(self) -> None:
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.finished]
+        expired = {job.id for job in finished if now - (job.finished_at or now) >= self.ttl}
+        overflow = len(finished) - len(expired) - self.max_finished
+        if overflow > 0:
+            alive = sorted((job for job in finished if job.id not in expired), key=lambda job: job.finished_at or 0)
+            expired.update(job.id for job in alive[:overflow])
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if self._by_key.get(job.key) == job_id:
+                del self._by_key[job.key]
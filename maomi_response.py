@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Web 响应层
+
+- FastJSONProvider：jsonify 改用 maomi_spider.json_dumps（安装 orjson 时直接产出 UTF-8 bytes），
+  不支持的类型退回 Flask 默认编码器。
+- compress_response：按 Accept-Encoding 协商 br / gzip，压缩 1KB 以上的 JSON、HTML 与文本响应；
+  流式响应与已带 Content-Encoding 的响应原样放行。brotli 需 pip install brotli，未安装时只用 gzip。
+- CachedBody：内容很少变化的响应体（控制台首页、分类列表），弱 ETag 与各编码的最高压缩级别结果
+  只计算一次；GET 带匹配的 If-None-Match 时返回 304。
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Flask, Request, Response, request
+from flask.json.provider import DefaultJSONProvider
+
+from maomi_spider import json_dumps
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - 可选依赖
+    brotli = None
+
+COMPRESS_MIN_BYTES = 1024
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "text/html",
+    "text/plain",
+    "text/csv",
+}
+# 动态响应在请求线程上压缩，取速度优先的级别；CachedBody 只压缩一次，取最高级别
+DYNAMIC_LEVELS = {"gzip": 5, "br": 4}
+STATIC_LEVELS = {"gzip": 9, "br": 11}
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return json_dumps(obj).decode("utf-8")
+        except TypeError:
+            return super().dumps(obj)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = json_dumps(obj)
+        except TypeError:
+            body = super().dumps(obj).encode("utf-8")
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(req: Request) -> Optional[str]:
+    """按 Accept-Encoding 的 q 值选择 br / gzip，都不接受时返回 None。"""
+    return req.accept_encodings.best_match(supported_encodings())
+
+
+def compress(data: bytes, encoding: str, static: bool = False) -> bytes:
+    level = (STATIC_LEVELS if static else DYNAMIC_LEVELS)[encoding]
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_response(response: Response) -> Response:
+    """after_request 钩子：协商压缩动态响应。"""
+    response.vary.add("Accept-Encoding")
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    encoding = negotiate_encoding(request)
+    if encoding is None:
+        return response
+    response.set_data(compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+class CachedBody:
+    """不常变化的响应体：ETag 与压缩结果按编码缓存，每次请求只做协商与查表。"""
+
+    def __init__(self, data: bytes, mimetype: str, cache_control: str = "no-cache") -> None:
+        self.data = data
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        # 同一内容的 identity / gzip / br 版本语义相同，共用一个弱 ETag
+        self.etag = hashlib.blake2b(data, digest_size=12).hexdigest()
+        self._encoded: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        if encoding is None or len(self.data) < COMPRESS_MIN_BYTES:
+            return self.data
+        with self._lock:
+            body = self._encoded.get(encoding)
+            if body is None:
+                body = self._encoded[encoding] = compress(self.data, encoding, static=True)
+        return body
+
+    def response(self) -> Response:
+        resp = Response(mimetype=self.mimetype)
+        resp.set_etag(self.etag, weak=True)
+        resp.headers["Cache-Control"] = self.cache_control
+        resp.vary.add("Accept-Encoding")
+        if request.method in ("GET", "HEAD") and request.if_none_match.contains_weak(self.etag):
+            resp.status_code = 304
+            return resp
+        encoding = negotiate_encoding(request) if len(self.data) >= COMPRESS_MIN_BYTES else None
+        resp.set_data(self.encoded(encoding))
+        if encoding is not None:
+            resp.headers["Content-Encoding"] = encoding
+        return resp
+
+
+def install_response_layer(app: Flask) -> None:
+    app.json = FastJSONProvider(app)
+    app.after_request(compress_response)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地全文检索
+
+- 倒排索引覆盖 title / description / tags，随页面写入增量更新；同一 id 再次写入时替换旧文档。
+- 中日韩文本按字切分为一元 + 二元 n-gram，拉丁字母与数字按词切分，统一做 NFKC 与小写归一。
+- 查询词全部命中（AND）才返回，按 BM25 排序，标题与标签权重高于描述；支持标签过滤与时长区间。
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from maomi_spider import Video
+from maomi_store import VIDEO_COLUMNS, VideoStore, split_tags
+
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "description": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 200
+
+# 连续的中日韩字符（假名、CJK 扩展 A、基本区、兼容区、谚文），或连续的字母数字
+CJK_RANGES = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+TOKEN_PATTERN = re.compile(f"[{CJK_RANGES}]+|[0-9a-z]+")
+CJK_PATTERN = re.compile(f"[{CJK_RANGES}]")
+
+SearchDoc = Union[Video, Dict[str, Any]]
+
+
+def normalize_text(text: Any) -> str:
+    return unicodedata.normalize("NFKC", str(text or "")).lower()
+
+
+def tokenize(text: Any) -> List[str]:
+    """中日韩连续片段产出单字与相邻二字，其余按字母数字词切分。"""
+    tokens: List[str] = []
+    for run in TOKEN_PATTERN.findall(normalize_text(text)):
+        if CJK_PATTERN.match(run):
+            tokens.extend(run)
+            tokens.extend(run[idx : idx + 2] for idx in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def query_terms(text: Any) -> List[str]:
+    """查询侧切分：多字片段只用二元组（已隐含单字信息），单字片段用单字，减少无谓的倒排求交。"""
+    terms: List[str] = []
+    for run in TOKEN_PATTERN.findall(normalize_text(text)):
+        if CJK_PATTERN.match(run) and len(run) > 1:
+            terms.extend(run[idx : idx + 2] for idx in range(len(run) - 1))
+        else:
+            terms.append(run)
+    return list(dict.fromkeys(terms))
+
+
+def _field(doc: SearchDoc, name: str) -> Any:
+    return doc.get(name) if isinstance(doc, dict) else getattr(doc, name)
+
+
+def _as_dict(doc: SearchDoc) -> Dict[str, Any]:
+    return doc.to_dict() if isinstance(doc, Video) else dict(doc)
+
+
+@dataclass
+class SearchHit:
+    score: float
+    video: Dict[str, Any]
+
+
+class SearchIndex:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._docs: Dict[Any, SearchDoc] = {}
+        self._doc_terms: Dict[Any, Dict[str, float]] = {}
+        self._doc_tags: Dict[Any, List[str]] = {}
+        self._postings: Dict[str, Dict[Any, float]] = {}
+        self._tags: Dict[str, Set[Any]] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, videos: Iterable[SearchDoc]) -> int:
+        """写入（或替换）一批视频，返回写入条数。"""
+        added = 0
+        with self._lock:
+            for video in videos:
+                doc_id = _field(video, "id")
+                if doc_id is None:
+                    continue
+                self._remove(doc_id)
+                weights: Dict[str, float] = {}
+                for name, weight in FIELD_WEIGHTS.items():
+                    for token in tokenize(_field(video, name)):
+                        weights[token] = weights.get(token, 0.0) + weight
+                for token, weight in weights.items():
+                    self._postings.setdefault(token, {})[doc_id] = weight
+                tags = [normalize_text(tag) for tag in split_tags(_field(video, "tags"))]
+                for tag in tags:
+                    self._tags.setdefault(tag, set()).add(doc_id)
+                self._docs[doc_id] = video
+                self._doc_terms[doc_id] = weights
+                self._doc_tags[doc_id] = tags
+                self._total_length += sum(weights.values())
+                added += 1
+        return added
+
+    def _remove(self, doc_id: Any) -> None:
+        weights = self._doc_terms.pop(doc_id, None)
+        if weights is None:
+            return
+        for token in weights:
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self._postings[token]
+        for tag in self._doc_tags.pop(doc_id, ()):
+            members = self._tags.get(tag)
+            if members is not None:
+                members.discard(doc_id)
+                if not members:
+                    del self._tags[tag]
+        self._total_length -= sum(weights.values())
+        del self._docs[doc_id]
+
+    def search(
+        self,
+        query: str = "",
+        tags: Iterable[str] = (),
+        min_duration: Optional[float] = None,
+        max_duration: Optional[float] = None,
+        offset: int = 0,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+    ) -> Tuple[int, List[SearchHit]]:
+        """返回 (命中总数, 按得分排序后 offset/limit 窗口内的结果)；无查询词时按 id 倒序。"""
+        terms = query_terms(query)
+        wanted_tags = [normalize_text(tag) for tag in tags if str(tag).strip()]
+        limit = max(0, min(limit, MAX_SEARCH_LIMIT))
+        with self._lock:
+            candidates = self._candidates(terms, wanted_tags)
+            if min_duration is not None or max_duration is not None:
+                candidates = {
+                    doc_id
+                    for doc_id in candidates
+                    if _in_range(_field(self._docs[doc_id], "duration_seconds"), min_duration, max_duration)
+                }
+            scored = (((self._score(doc_id, terms) if terms else 0.0), doc_id) for doc_id in candidates)
+            window = heapq.nlargest(max(0, offset) + limit, scored, key=_rank_key)[max(0, offset) :]
+            hits = [SearchHit(round(score, 4), _as_dict(self._docs[doc_id])) for score, doc_id in window]
+        return len(candidates), hits
+
+    def _candidates(self, terms: List[str], tags: List[str]) -> Set[Any]:
+        sets: List[Set[Any]] = []
+        for term in terms:
+            posting = self._postings.get(term)
+            if not posting:
+                return set()
+            sets.append(set(posting))
+        for tag in tags:
+            members = self._tags.get(tag)
+            if not members:
+                return set()
+            sets.append(members)
+        if not sets:
+            return set(self._docs)
+        sets.sort(key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            result &= other
+            if not result:
+                break
+        return result
+
+    def _score(self, doc_id: Any, terms: List[str]) -> float:
+        total_docs = len(self._docs)
+        avg_length = self._total_length / total_docs if total_docs else 1.0
+        doc_length = sum(self._doc_terms[doc_id].values())
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_length / (avg_length or 1.0))
+        score = 0.0
+        for term in terms:
+            posting = self._postings[term]
+            tf = posting[doc_id]
+            idf = math.log(1 + (total_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return score
+
+    def load_store(self, path: str) -> int:
+        """从 maomi_store 的 SQLite 库载入已采集的视频。"""
+        with VideoStore(path) as store:
+            rows = store.conn.execute(f"SELECT {', '.join(VIDEO_COLUMNS)} FROM videos").fetchall()
+        return self.add(dict(zip(VIDEO_COLUMNS, row)) for row in rows)
+
+
+def _in_range(value: Any, low: Optional[float], high: Optional[float]) -> bool:
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return False
+    return (low is None or seconds >= low) and (high is None or seconds <= high)
+
+
+def _rank_key(entry: Tuple[float, Any]) -> Tuple[float, Any]:
+    score, doc_id = entry
+    return score, doc_id if isinstance(doc_id, (int, float)) else 0
+
+
+def timed_search(index: SearchIndex, **kwargs: Any) -> Dict[str, Any]:
+    start = time.perf_counter()
+    total, hits = index.search(**kwargs)
+    return {
+        "total": total,
+        "took_ms": round((time.perf_counter() - start) * 1e3, 3),
+        "results": [{**hit.video, "score": hit.score} for hit in hits],
+    }
@@ -13,16 +13,36 @@ from __future__ import annotations
 
 import argparse
 import base64
+import binascii
 import hashlib
 import json
 import os
+import random
+import socket
 import sys
+import threading
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import quote
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple, Union
+from urllib.parse import quote, urlsplit
 
 import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - 可选加速依赖
+    orjson = None
 from Crypto.Cipher import AES  # type: ignore[import-untyped]
 from Crypto.Util.Padding import pad, unpad  # type: ignore[import-untyped]
 
@@ -43,6 +63,21 @@ SUPPORTED_CHANNELS = {
     "news",
 }
 DEFAULT_PAGE_SIZE = 50
+TOKEN_TTL_SECONDS = 6 * 3600
+TOKEN_EXPIRY_MARGIN = 60
+DEFAULT_TOKEN_CACHE = os.path.join(os.path.expanduser("~"), ".maomi_token_cache")
+AUTH_REJECTED_STATUSES = {401, 403}
+DEFAULT_CONCURRENCY = 1
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TOPIC_CONCURRENCY = 4
+CATALOG_TTL_SECONDS = 600
+RESPONSE_CACHE_TTLS = {"list": 300.0, "topic": 1800.0}
+RESPONSE_CACHE_MAX_ENTRIES = 512
+RESPONSE_CACHE_MAX_DISK_BYTES = 256 * 1024 * 1024
+MAX_KNOWN_IDS = 5000
+METRIC_PHASES = ("connect", "ttfb", "download", "decrypt", "parse", "format")
+EXPORT_FORMATS = ("jsonl", "jsonl.gz", "jsonl.zst", "csv", "csv.gz", "parquet")
+METRIC_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
 
 KEY_B64 = "SWRUSnEwSGtscHVJNm11OGlCJU9PQCF2ZF40SyZ1WFc="
 IV_B64 = "JDB2QGtySDdWMg=="
@@ -50,6 +85,44 @@ SIGN_KEY_B64 = "JkI2OG1AJXpnMzJfJXUqdkhVbEU0V2tTJjFKNiUleG1VQGZO"
 DEFAULT_SUFFIX = "123456"
 
 
+VIDEO_SOURCE_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "tags",
+    "duration",
+    "insert_time",
+    "update_time",
+    "video_url",
+    "down_url",
+    "thumb",
+    "preview",
+)
+TOPIC_META_FIELDS = (
+    "title",
+    "desc",
+    "price",
+    "vip_price",
+    "gif_images",
+    "cover",
+    "phone_cover",
+    "file",
+    "free_videos_id",
+)
+
+# 安装了 orjson 时直接从 bytes 解析，否则退回标准库（json.loads 同样接受 utf-8 bytes）
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+json_loads: Callable[[Union[str, bytes]], Any] = orjson.loads if orjson is not None else json.loads
+
+
+def _std_json_dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# 紧凑的 UTF-8 bytes 序列化，供导出与 Web 响应使用；orjson 输出格式与之相同
+json_dumps: Callable[[Any], bytes] = orjson.dumps if orjson is not None else _std_json_dumps
+
+
 def b64decode_str(value: str) -> str:
     return base64.b64decode(value).decode("utf-8")
 
@@ -59,6 +132,7 @@ IV_BASE = b64decode_str(IV_B64)
 SIGN_KEY = b64decode_str(SIGN_KEY_B64)
 
 
+@lru_cache(maxsize=64)
 def derive_iv(suffix: Optional[str]) -> bytes:
     seq = (IV_BASE + (suffix or DEFAULT_SUFFIX))[:16]
     return seq.encode("utf-8")
@@ -76,6 +150,40 @@ def aes_decrypt(cipher_b64: str, suffix: Optional[str]) -> str:
     return unpad(decrypted, AES.block_size).decode("utf-8")
 
 
+class CryptoEngine:
+    """批量解密用的 AES-CBC 引擎。
+
+    suffix 只有少数几种取值，派生 IV 由 derive_iv 的 lru_cache 记忆。decrypt 返回明文 bytes，
+    可直接交给 json.loads，省去中间的 str 解码。
+    """
+
+    def __init__(self, key: bytes = KEY_BYTES) -> None:
+        self.key = key
+
+    def decrypt(self, cipher_b64: Union[str, bytes], suffix: Optional[str]) -> bytes:
+        cipher = AES.new(self.key, AES.MODE_CBC, derive_iv(suffix))
+        return unpad(cipher.decrypt(binascii.a2b_base64(cipher_b64)), AES.block_size)
+
+    def decrypt_text(self, cipher_b64: Union[str, bytes], suffix: Optional[str]) -> str:
+        return self.decrypt(cipher_b64, suffix).decode("utf-8")
+
+    def decrypt_many(
+        self, payloads: Iterable[Tuple[Union[str, bytes], Optional[str]]], processes: int = 0
+    ) -> List[str]:
+        """批量解密 (密文, suffix)；processes > 1 时分发到进程池，适合大规模回填。"""
+        if processes > 1:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                return list(pool.map(partial(_decrypt_worker, self.key), payloads, chunksize=16))
+        return [self.decrypt_text(cipher_b64, suffix) for cipher_b64, suffix in payloads]
+
+
+CRYPTO = CryptoEngine()
+
+
+def _decrypt_worker(key: bytes, item: Tuple[Union[str, bytes], Optional[str]]) -> str:
+    return CryptoEngine(key).decrypt_text(*item)
+
+
 def obj_key_sort(payload: Dict[str, Any]) -> List[tuple[str, Any]]:
     return sorted(((k, payload[k]) for k in payload), key=lambda kv: kv[0])
 
@@ -118,6 +226,904 @@ class LoginResult:
     raw: Dict[str, Any]
 
 
+@dataclass(slots=True)
+class Video:
+    """单条视频记录：只保存原始字段，派生 URL 与时分秒在访问时才计算。
+
+    to_dict() 输出原有 13 个字段的 JSON 结构，键与顺序保持不变。
+    """
+
+    id: Any
+    title: Optional[str]
+    description: Optional[str]
+    tags: Any
+    duration_seconds: Any
+    insert_time: Any
+    update_time: Any
+    video_path: str
+    down_path: str
+    thumb_path: Optional[str]
+    preview_path: str
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any]) -> "Video":
+        get = item.get
+        return cls(
+            get("id"),
+            get("title"),
+            get("description"),
+            get("tags"),
+            get("duration"),
+            get("insert_time"),
+            get("update_time"),
+            get("video_url", ""),
+            get("down_url", ""),
+            get("thumb"),
+            get("preview", ""),
+        )
+
+    @property
+    def duration_hms(self) -> str:
+        return seconds_to_hms(self.duration_seconds)
+
+    @property
+    def detail_url(self) -> str:
+        return DETAIL_TEMPLATE.format(id=self.id)
+
+    @property
+    def video_hls(self) -> str:
+        return urljoin_like(STREAM_HOST, self.video_path)
+
+    @property
+    def video_mp4(self) -> str:
+        return urljoin_like(STREAM_HOST, self.down_path)
+
+    @property
+    def thumb_url(self) -> Optional[str]:
+        return normalize_thumb(self.thumb_path)
+
+    @property
+    def preview_url(self) -> str:
+        return urljoin_like(STREAM_HOST, self.preview_path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "tags": self.tags,
+            "duration_seconds": self.duration_seconds,
+            "duration_hms": self.duration_hms,
+            "insert_time": self.insert_time,
+            "update_time": self.update_time,
+            "detail_url": self.detail_url,
+            "video_hls": self.video_hls,
+            "video_mp4": self.video_mp4,
+            "thumb_url": self.thumb_url,
+            "preview_url": self.preview_url,
+        }
+
+    def to_row(self) -> List[Any]:
+        """原始字段按声明顺序排成列表，供断点文件紧凑存储；Video(*row) 即可还原。"""
+        return [getattr(self, name) for name in self.__slots__]
+
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, Video):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+@dataclass
+class CachedToken:
+    token: str
+    raw: Dict[str, Any]
+    expires_at: float
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.time()) >= self.expires_at
+
+
+def credential_fingerprint(username: str, password: str) -> str:
+    return hashlib.sha256(f"{username}\0{password}".encode("utf-8")).hexdigest()
+
+
+def token_expiry(token: str, ttl: float, now: Optional[float] = None) -> float:
+    """TTL 与 JWT exp（若可解析）取较早者，提前 TOKEN_EXPIRY_MARGIN 秒过期。"""
+    now = now if now is not None else time.time()
+    expires_at = now + ttl
+    parts = token.split(".")
+    if len(parts) == 3:
+        try:
+            segment = parts[1] + "=" * (-len(parts[1]) % 4)
+            claims = json.loads(base64.urlsafe_b64decode(segment))
+            exp = float(claims["exp"])
+        except (ValueError, KeyError, TypeError):
+            return expires_at
+        expires_at = min(expires_at, exp - TOKEN_EXPIRY_MARGIN)
+    return expires_at
+
+
+class TokenStore(ABC):
+    """按用户名缓存登录 token；凭据指纹不一致时视为未命中。"""
+
+    @abstractmethod
+    def load(self, username: str, password: str) -> Optional[CachedToken]:
+        ...
+
+    @abstractmethod
+    def save(self, username: str, password: str, entry: CachedToken) -> None:
+        ...
+
+    @abstractmethod
+    def discard(self, username: str) -> None:
+        ...
+
+
+class MemoryTokenStore(TokenStore):
+    """进程内缓存，供 Flask 等长驻进程复用。"""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[str, CachedToken]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, username: str, password: str) -> Optional[CachedToken]:
+        with self._lock:
+            hit = self._entries.get(username)
+            if not hit:
+                return None
+            fingerprint, entry = hit
+            if fingerprint != credential_fingerprint(username, password) or entry.expired():
+                self._entries.pop(username, None)
+                return None
+            return entry
+
+    def save(self, username: str, password: str, entry: CachedToken) -> None:
+        with self._lock:
+            self._entries[username] = (credential_fingerprint(username, password), entry)
+
+    def discard(self, username: str) -> None:
+        with self._lock:
+            self._entries.pop(username, None)
+
+
+class FileTokenStore(TokenStore):
+    """磁盘缓存，供命令行多次运行复用。
+
+    每条记录以 sha256(用户名) 为键，内容用由账号密码派生的 AES-256 密钥加密，
+    密码不对时无法解密，自然视为未命中。
+    """
+
+    def __init__(self, path: str = DEFAULT_TOKEN_CACHE) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry_key(username: str) -> str:
+        return hashlib.sha256(username.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _cipher_key(username: str, password: str) -> bytes:
+        return hashlib.sha256(f"maomi-token\0{username}\0{password}".encode("utf-8")).digest()
+
+    def _read(self) -> Dict[str, str]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, data: Dict[str, str]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(tmp_path, self.path)
+
+    def load(self, username: str, password: str) -> Optional[CachedToken]:
+        with self._lock:
+            blob = self._read().get(self._entry_key(username))
+        if not blob:
+            return None
+        try:
+            raw = base64.b64decode(blob)
+            cipher = AES.new(self._cipher_key(username, password), AES.MODE_CBC, raw[:16])
+            data = json.loads(unpad(cipher.decrypt(raw[16:]), AES.block_size).decode("utf-8"))
+            entry = CachedToken(token=data["token"], raw=data["raw"], expires_at=float(data["expires_at"]))
+        except (ValueError, KeyError, TypeError):
+            return None
+        return None if entry.expired() else entry
+
+    def save(self, username: str, password: str, entry: CachedToken) -> None:
+        plain = json.dumps(
+            {"token": entry.token, "raw": entry.raw, "expires_at": entry.expires_at},
+            ensure_ascii=False,
+        )
+        iv = os.urandom(16)
+        cipher = AES.new(self._cipher_key(username, password), AES.MODE_CBC, iv)
+        encrypted = cipher.encrypt(pad(plain.encode("utf-8"), AES.block_size))
+        with self._lock:
+            data = self._read()
+            data[self._entry_key(username)] = base64.b64encode(iv + encrypted).decode("utf-8")
+            self._write(data)
+
+    def discard(self, username: str) -> None:
+        with self._lock:
+            data = self._read()
+            if data.pop(self._entry_key(username), None) is not None:
+                self._write(data)
+
+
+@dataclass
+class RetryPolicy:
+    """请求超时与重试策略：5xx/429/超时/连接错误按带抖动的指数退避重试，尊重 Retry-After。"""
+
+    connect_timeout: float = 5.0
+    read_timeout: float = 15.0
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 10.0
+    max_retry_after: float = 60.0
+    retry_statuses: frozenset = frozenset({429, 500, 502, 503, 504})
+    breaker_threshold: int = 5
+    breaker_cooldown: float = 30.0
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return self.connect_timeout, self.read_timeout
+
+    def backoff(self, attempt: int) -> float:
+        # full jitter：在 [0, min(上限, base * 2^attempt)] 内均匀取值，避免并发请求同时重试
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2**attempt)))
+
+    def retry_after(self, value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), self.max_retry_after)
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class HostCircuitBreaker:
+    """按域名熔断：连续失败 threshold 次后在 cooldown 秒内直接拒绝请求，之后只放行一次试探。
+
+    状态按域名保存，可被多个客户端共享（Web 控制台每个请求新建客户端，共用一个模块级实例）。
+    半开状态下试探请求结束前其余请求仍被拒绝；试探超过 cooldown 仍未回报结果时允许再试探一次。
+    """
+
+    def __init__(self, threshold: int, cooldown: float) -> None:
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_policy(cls, policy: RetryPolicy) -> "HostCircuitBreaker":
+        return cls(policy.breaker_threshold, policy.breaker_cooldown)
+
+    def before(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            probe_started = self._probing.get(host)
+            if probe_started is not None:
+                if now - probe_started < self.cooldown:
+                    raise CircuitOpenError(f"{host} 熔断恢复中，正在等待试探请求的结果")
+                # 上一个试探未回报结果（如非网络异常），改由本次请求试探
+                self._probing[host] = now
+                return
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            remaining = opened_at + self.cooldown - now
+            if remaining > 0:
+                raise CircuitOpenError(f"{host} 连续失败过多，已熔断，约 {remaining:.0f} 秒后重试")
+            # 冷却结束：进入半开状态，只放行本次请求作为试探，失败会立即再次熔断
+            del self._opened_at[host]
+            self._probing[host] = now
+            self._failures[host] = self.threshold - 1
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+            self._probing.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            self._probing.pop(host, None)
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.threshold:
+                self._opened_at[host] = time.monotonic()
+
+
+class HostRateLimiter:
+    """按域名限速：同一域名两次请求之间至少间隔 1/rate 秒，可跨线程共享。"""
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate 必须 > 0")
+        self.interval = 1.0 / rate
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> None:
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+@dataclass
+class TransportConfig:
+    """HTTP 传输层配置。
+
+    - pool_size：每个域名保留的 keep-alive 连接数，默认取 max(10, 并发数)；pool_block 为 True 时
+      连接用尽后排队等待，否则临时新建连接、用完即丢。
+    - keepalive=False 时每个请求都带 Connection: close；开启时同时打开 TCP keepalive 与 TCP_NODELAY。
+    - dns_cache_ttl > 0 时在进程内缓存 getaddrinfo 结果（见 DnsCache）。
+    - http2=True 时改用 httpx 发送请求（需 pip install "httpx[http2]"），经 TLS ALPN 协商 HTTP/2，
+      同一域名的并发请求复用一条连接；keepalive_expiry 仅对该后端生效。
+    """
+
+    pool_size: Optional[int] = None
+    pool_block: bool = False
+    keepalive: bool = True
+    keepalive_expiry: float = 30.0
+    dns_cache_ttl: float = 0.0
+    http2: bool = False
+
+
+class DnsCache:
+    """进程级 DNS 缓存：包装 socket.getaddrinfo，TTL 内相同参数直接返回上次结果。
+
+    urllib3 与 httpx 建连时都经过 socket.getaddrinfo，因此对两种后端同时生效。
+    """
+
+    def __init__(self) -> None:
+        self.ttl = 0.0
+        self._entries: Dict[Tuple[Any, ...], Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._resolve = socket.getaddrinfo
+
+    def install(self, ttl: float) -> None:
+        self.ttl = ttl
+        if getattr(socket.getaddrinfo, "__self__", None) is not self:
+            socket.getaddrinfo = self.getaddrinfo  # type: ignore[assignment]
+
+    def getaddrinfo(self, *args: Any, **kwargs: Any) -> Any:
+        key = args + tuple(sorted(kwargs.items()))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+        result = self._resolve(*args, **kwargs)
+        with self._lock:
+            self._entries[key] = (now + self.ttl, result)
+        return result
+
+
+DNS_CACHE = DnsCache()
+
+
+# 当前线程累计的建连耗时（含 TLS 握手），ClientMetrics 用前后差值拆出 connect 阶段
+_CONNECT_TIME = threading.local()
+
+
+def connect_seconds() -> float:
+    return getattr(_CONNECT_TIME, "seconds", 0.0)
+
+
+class _TimedConnectMixin:
+    def connect(self) -> None:
+        start = time.perf_counter()
+        try:
+            super().connect()  # type: ignore[misc]
+        finally:
+            _CONNECT_TIME.seconds = connect_seconds() + time.perf_counter() - start
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TunedHTTPAdapter(HTTPAdapter):
+    """在 urllib3 连接上打开 TCP_NODELAY 与 TCP keepalive，及时发现被对端静默断开的空闲连接；
+    新建连接时记录建连耗时（只发生在建连时，keep-alive 复用不产生开销）。"""
+
+    SOCKET_OPTIONS = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs["socket_options"] = self.SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class Http2Adapter(BaseAdapter):
+    """用 httpx（HTTP/2）发送 requests 的请求，再转换回 requests.Response。
+
+    挂载到 Session 后，登录、重试、鉴权与异常处理逻辑都无需改动；httpx 的传输异常
+    转换为 requests.ConnectionError / Timeout，保持重试语义一致。
+    """
+
+    def __init__(self, pool_size: int, keepalive_expiry: float) -> None:
+        super().__init__()
+        try:
+            import httpx
+        except ImportError:
+            raise RuntimeError('HTTP/2 需要 httpx，请先执行 pip install "httpx[http2]"') from None
+        self._httpx = httpx
+        self.client = httpx.Client(
+            http2=True,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout: Any = None, **kwargs: Any) -> requests.Response:
+        httpx = self._httpx
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        try:
+            upstream = self.client.request(
+                request.method or "GET",
+                request.url or "",
+                headers=dict(request.headers),
+                content=request.body,
+                timeout=httpx.Timeout(read, connect=connect),
+            )
+        except httpx.TimeoutException as exc:
+            raise requests.Timeout(str(exc), request=request) from exc
+        except httpx.TransportError as exc:
+            raise requests.ConnectionError(str(exc), request=request) from exc
+        resp = requests.Response()
+        resp.status_code = upstream.status_code
+        resp.reason = upstream.reason_phrase
+        resp.headers = CaseInsensitiveDict(upstream.headers)
+        resp._content = upstream.content
+        resp.encoding = upstream.encoding
+        resp.url = str(upstream.url)
+        resp.elapsed = upstream.elapsed
+        resp.request = request
+        resp.connection = self
+        return resp
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class Histogram:
+    """Prometheus 风格的累积直方图（单位秒），分位数按桶内线性插值估算；由调用方加锁。"""
+
+    def __init__(self, buckets: Tuple[float, ...] = METRIC_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 最后一格为 +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[idx - 1] if idx else 0.0
+                upper = self.buckets[idx] if idx < len(self.buckets) else lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class ClientMetrics:
+    """热路径计时：每个请求拆分为 connect / ttfb / download，再加上 decrypt、parse（JSON）与
+    format（构建 Video 记录）各阶段的直方图，以及接收字节数、请求 / 页 / 条目计数。
+
+    未启用时 MaomiClient.metrics 为 None，各处只多一次 None 判断。可在多个客户端之间共享。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.phases = {phase: Histogram() for phase in METRIC_PHASES}
+        self.requests = 0
+        self.bytes_in = 0
+        self.pages = 0
+        self.items = 0
+        self.started_at = time.monotonic()
+
+    def record_response(self, connect: float, ttfb: float, download: float, size: int) -> None:
+        with self._lock:
+            self.phases["connect"].observe(connect)
+            self.phases["ttfb"].observe(ttfb)
+            self.phases["download"].observe(download)
+            self.requests += 1
+            self.bytes_in += size
+
+    def record_page(self, items: int, seconds: float) -> None:
+        with self._lock:
+            self.phases["format"].observe(seconds)
+            self.pages += 1
+            self.items += items
+
+    def decode(self, content: bytes) -> Any:
+        """与 decrypt_payload(json_loads(content)) 等价，分别计入 parse 与 decrypt。"""
+        start = time.perf_counter()
+        envelope = json_loads(content)
+        parsed = time.perf_counter()
+        plain = CRYPTO.decrypt(envelope["data"], envelope.get("suffix"))
+        decrypted = time.perf_counter()
+        data = json_loads(plain)
+        done = time.perf_counter()
+        with self._lock:
+            self.phases["decrypt"].observe(decrypted - parsed)
+            self.phases["parse"].observe((parsed - start) + (done - decrypted))
+        return data
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started_at, 1e-9)
+            return {
+                "elapsed_s": elapsed,
+                "requests": self.requests,
+                "bytes_in": self.bytes_in,
+                "pages": self.pages,
+                "items": self.items,
+                "pages_per_s": self.pages / elapsed,
+                "items_per_s": self.items / elapsed,
+                "phases": {
+                    name: {
+                        "count": hist.count,
+                        "total_s": hist.total,
+                        "mean_ms": hist.total / hist.count * 1e3 if hist.count else 0.0,
+                        "p50_ms": hist.quantile(0.5) * 1e3,
+                        "p90_ms": hist.quantile(0.9) * 1e3,
+                        "p99_ms": hist.quantile(0.99) * 1e3,
+                    }
+                    for name, hist in self.phases.items()
+                },
+            }
+
+    def render_prometheus(self, prefix: str = "maomi") -> str:
+        lines = [
+            f"# HELP {prefix}_phase_seconds 各阶段耗时",
+            f"# TYPE {prefix}_phase_seconds histogram",
+        ]
+        with self._lock:
+            for name, hist in self.phases.items():
+                cumulative = 0
+                for bound, count in zip(hist.buckets + (float("inf"),), hist.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{prefix}_phase_seconds_bucket{{phase="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{prefix}_phase_seconds_sum{{phase="{name}"}} {hist.total}')
+                lines.append(f'{prefix}_phase_seconds_count{{phase="{name}"}} {hist.count}')
+            for name, value in (
+                ("requests", self.requests),
+                ("bytes_in", self.bytes_in),
+                ("pages", self.pages),
+                ("items", self.items),
+            ):
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                lines.append(f"{prefix}_{name}_total {value}")
+        return "\n".join(lines) + "\n"
+
+
+def build_transport_adapter(config: TransportConfig, concurrency: int) -> BaseAdapter:
+    pool_size = config.pool_size or max(DEFAULT_POOL_SIZE, concurrency)
+    if config.http2:
+        return Http2Adapter(pool_size, config.keepalive_expiry)
+    return TunedHTTPAdapter(pool_connections=DEFAULT_POOL_SIZE, pool_maxsize=pool_size, pool_block=config.pool_block)
+
+
+class IncrementalState:
+    """增量采集状态：按 (channel, slug) 记录最新的 id / update_time 以及最近见过的 id。
+
+    列表按时间倒序，翻到整页都是已知 id 时即可停止；每个键最多保留 MAX_KNOWN_IDS 个 id。
+    同一次运行内 record 按页序（新 → 旧）调用，本次见到的 id 依次追加，整体排在上次的状态之前，
+    截断时丢弃的总是最旧的 id，逐页记录与整批记录的结果一致。
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._known: Dict[str, set] = {}
+        self._previous: Dict[str, List[Any]] = {}
+        self._fresh: Dict[str, List[Any]] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                self.data: Dict[str, Dict[str, Any]] = json.load(file)
+        except FileNotFoundError:
+            self.data = {}
+
+    @staticmethod
+    def key(channel: str, slug: str) -> str:
+        return f"{channel}:{slug}"
+
+    def known_ids(self, key: str) -> set:
+        with self._lock:
+            if key not in self._known:
+                self._known[key] = set((self.data.get(key) or {}).get("known_ids") or [])
+            return self._known[key]
+
+    def record(self, key: str, videos: List[Video]) -> None:
+        if not videos:
+            return
+        with self._lock:
+            entry = self.data.setdefault(key, {})
+            if key not in self._previous:
+                self._previous[key] = list(entry.get("known_ids") or [])
+            fresh = self._fresh.setdefault(key, [])
+            fresh.extend(video.id for video in videos if video.id is not None)
+            merged = list(dict.fromkeys(fresh + self._previous[key]))[:MAX_KNOWN_IDS]
+            newest = max(videos, key=lambda video: video.update_time or 0)
+            if (newest.update_time or 0) >= (entry.get("newest_update_time") or 0):
+                entry["newest_id"] = newest.id
+                entry["newest_update_time"] = newest.update_time
+            entry["known_ids"] = merged
+            self._known[key] = set(merged)
+
+    def save(self) -> None:
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(self.data, file, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+class CrawlCheckpoint:
+    """断点续采记录：追加写的 JSONL，每完成一页写一行（键、页码、last_page 与视频原始字段）。
+
+    - 逐页模式在调用方处理完该页（写出 / 入库）后才记录；批量模式在拉到页时记录，
+      分类整体写出后再追加一行 complete 标记。
+    - 每行附带 output_offset：输出文件中已完整写出的位置，续采时先截断到这里，
+      丢弃中断时写了一半的内容。
+    - resume=True 时载入已有记录并追加，否则覆盖旧文件；全部完成后调用 discard() 删除。
+    """
+
+    def __init__(self, path: str, resume: bool = False) -> None:
+        self.path = path
+        self.output_offset: Optional[int] = None
+        self._lock = threading.Lock()
+        self._pages: Dict[str, Dict[int, VideoPage]] = {}
+        self._complete: set = set()
+        if resume:
+            self._load()
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+
+    @staticmethod
+    def key(category: Category) -> str:
+        if category.channel == "topic":
+            return IncrementalState.key("topic", str(category.topic_id))
+        return IncrementalState.key(category.channel.strip(), category.slug)
+
+    def _load(self) -> None:
+        try:
+            file = open(self.path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # 中断时写了一半的末行
+                self.output_offset = entry.get("output_offset", self.output_offset)
+                if entry.get("complete"):
+                    self._complete.add(entry["key"])
+                    continue
+                self._pages.setdefault(entry["key"], {})[entry["page"]] = VideoPage(
+                    entry["page"],
+                    entry["last_page"],
+                    entry["raw_count"],
+                    [Video(*row) for row in entry["videos"]],
+                    entry.get("topic_meta"),
+                    resumed=True,
+                )
+
+    def has(self, key: str, page: int) -> bool:
+        return page in self._pages.get(key, ())
+
+    def page(self, key: str, page: int) -> Optional[VideoPage]:
+        return self._pages.get(key, {}).get(page)
+
+    def pages(self, key: str) -> List[VideoPage]:
+        entries = self._pages.get(key, {})
+        return [entries[page] for page in sorted(entries)]
+
+    def last_page(self, key: str) -> Optional[int]:
+        entries = self._pages.get(key)
+        return next(iter(entries.values())).last_page if entries else None
+
+    def is_complete(self, key: str) -> bool:
+        return key in self._complete
+
+    def record(self, key: str, page: VideoPage) -> None:
+        self._append(
+            {
+                "key": key,
+                "page": page.page,
+                "last_page": page.last_page,
+                "raw_count": page.raw_count,
+                "videos": [video.to_row() for video in page.videos],
+                "topic_meta": page.topic_meta,
+            }
+        )
+
+    def mark_complete(self, key: str) -> None:
+        self._append({"key": key, "complete": True})
+        self._complete.add(key)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        entry["output_offset"] = self.output_offset
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def discard(self) -> None:
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class ResponseCache:
+    """列表页 / 专题详情的响应缓存，存放解密后的 JSON，命中时跳过网络与 AES。
+
+    键为不含 nocache 参数的规范 URL；每类接口单独设置 TTL。内存层为按条数淘汰的 LRU，
+    可选的磁盘层（disk_dir）按总字节数淘汰最久未写入的文件，跨进程/跨运行复用。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttls: Optional[Dict[str, float]] = None,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = RESPONSE_CACHE_MAX_DISK_BYTES,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttls = {**RESPONSE_CACHE_TTLS, **(ttls or {})}
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+    def get(self, endpoint: str, url: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            hit = self._entries.get(url)
+            if hit:
+                if hit[0] > now:
+                    self._entries.move_to_end(url)
+                    return hit[1]
+                del self._entries[url]
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(url), "r", encoding="utf-8") as file:
+                record = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if record.get("url") != url or record.get("expires_at", 0) <= now:
+            return None
+        self._remember(url, record["expires_at"], record["value"])
+        return record["value"]
+
+    def put(self, endpoint: str, url: str, value: Any) -> None:
+        ttl = self.ttls.get(endpoint)
+        if not ttl:
+            return
+        expires_at = time.time() + ttl
+        self._remember(url, expires_at, value)
+        if self.disk_dir:
+            self._write_disk(url, expires_at, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, url: str, expires_at: float, value: Any) -> None:
+        with self._lock:
+            self._entries[url] = (expires_at, value)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_path(self, url: str) -> str:
+        return os.path.join(self.disk_dir or "", hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _disk_files(self) -> List[Tuple[str, int, float]]:
+        files = []
+        for name in os.listdir(self.disk_dir or ""):
+            if name.endswith(".json"):
+                path = os.path.join(self.disk_dir or "", name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _write_disk(self, url: str, expires_at: float, value: Any) -> None:
+        path = self._disk_path(url)
+        data = json.dumps({"url": url, "expires_at": expires_at, "value": value}, ensure_ascii=False)
+        encoded = data.encode("utf-8")
+        with self._lock:
+            try:
+                previous = os.path.getsize(path)
+            except OSError:
+                previous = 0
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(encoded)
+            os.replace(tmp_path, path)
+            self._disk_bytes += len(encoded) - previous
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        files = sorted(self._disk_files(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in files)
+        for path, size, _ in files:
+            if total <= self.max_disk_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+
 @dataclass
 class Category:
     section: str
@@ -127,157 +1133,714 @@ class Category:
     topic_id: Optional[int] = None
 
 
+@dataclass
+class VideoPage:
+    page: int
+    last_page: int
+    raw_count: int
+    videos: List[Video]
+    topic_meta: Optional[Dict[str, Any]] = None
+    resumed: bool = False
+
+
+@dataclass
+class CrawlResult:
+    category: Category
+    videos: List[Video] = field(default_factory=list)
+    topic_meta: Optional[Dict[str, Any]] = None
+    pages_fetched: int = 0
+    error: Optional[str] = None
+    resumed: bool = False
+
+
+CrawlProgress = Callable[[Category, int, int], None]
+
+
+class CategoryCatalog:
+    """分类目录缓存，可在多个 MaomiClient 之间共享（如 Flask 进程内）。
+
+    - TTL 内直接返回缓存；过期后若开启 background_refresh，则先返回旧数据并在后台线程刷新。
+    - 刷新时携带上次的 ETag / Last-Modified 发条件请求，304 时仅续期。
+    - 维护 jump_name / 名称（小写）到分类的字典索引，查找为 O(1)。
+    """
+
+    def __init__(self, ttl: float = CATALOG_TTL_SECONDS, background_refresh: bool = True) -> None:
+        self.ttl = ttl
+        self.background_refresh = background_refresh
+        self.categories: List[Category] = []
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.fetched_at = 0.0
+        self._index: Dict[str, List[Category]] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self, client: "MaomiClient") -> List[Category]:
+        if not self.fetched_at:
+            self.refresh(client)
+        elif time.time() - self.fetched_at >= self.ttl:
+            if self.background_refresh:
+                self._refresh_in_background(client)
+            else:
+                self.refresh(client)
+        return self.categories
+
+    def lookup(self, identifier: str) -> List[Category]:
+        return list(self._index.get(identifier.strip().lower(), ()))
+
+    def refresh(self, client: "MaomiClient") -> None:
+        with self._refresh_lock:
+            result = client.fetch_catalog(self.etag, self.last_modified)
+            with self._lock:
+                if result is not None:
+                    categories, self.etag, self.last_modified = result
+                    self._index = build_category_index(categories)
+                    self.categories = categories
+                self.fetched_at = time.time()
+
+    def _refresh_in_background(self, client: "MaomiClient") -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run() -> None:
+            try:
+                self.refresh(client)
+            except Exception:  # noqa: BLE001 - 刷新失败时继续使用旧目录，下次访问再试
+                pass
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="maomi-catalog-refresh", daemon=True).start()
+
+
 class MaomiClient:
-    def __init__(self, username: str, password: str, suffix: str = DEFAULT_SUFFIX):
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        suffix: str = DEFAULT_SUFFIX,
+        token_store: Optional[TokenStore] = None,
+        token_ttl: float = TOKEN_TTL_SECONDS,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate_limit: Optional[float] = None,
+        since_state: Optional["IncrementalState"] = None,
+        catalog: Optional[CategoryCatalog] = None,
+        response_cache: Optional[ResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        checkpoint: Optional[CrawlCheckpoint] = None,
+        transport: Optional[TransportConfig] = None,
+        metrics: Optional[ClientMetrics] = None,
+        topic_concurrency: int = DEFAULT_TOPIC_CONCURRENCY,
+        breaker: Optional[HostCircuitBreaker] = None,
+    ):
         self.username = username
         self.password = password
         self.suffix = suffix
         self.session = requests.Session()
+        self.token_store = token_store
+        self.token_ttl = token_ttl
+        self.token_from_cache = False
+        self.concurrency = max(1, concurrency)
+        # 专题详情一次返回整个专题，体积远大于列表页；批量采集时单独限制同时下载的个数
+        self.topic_concurrency = max(1, topic_concurrency)
+        self.rate_limiter = HostRateLimiter(rate_limit) if rate_limit else None
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or HostCircuitBreaker.from_policy(self.retry_policy)
+        self.since_state = since_state
+        self.catalog = catalog or CategoryCatalog(background_refresh=False)
+        self.response_cache = response_cache
+        self.checkpoint = checkpoint
+        self.metrics = metrics
+        self.transport = transport or TransportConfig()
+        if self.transport.dns_cache_ttl > 0:
+            DNS_CACHE.install(self.transport.dns_cache_ttl)
+        if not self.transport.keepalive:
+            self.session.headers["Connection"] = "close"
+        # 专题详情在独立线程池中下载，连接池按两者之和预留
+        adapter = build_transport_adapter(self.transport, self.concurrency + self.topic_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
-    def login(self) -> LoginResult:
-        payload: Dict[str, Any] = {
-            "system": 1,
-            "timestamp": int(time.time() * 1000),
-            "device": "pc",
-            "username": self.username,
-            "password": self.password,
-            "phone_code": "+86",
-            "phone": 0,
-        }
-        payload["encode_sign"] = base64_sign(payload)
-        body = {"post-data": aes_encrypt(json.dumps(payload, separators=(",", ":")), self.suffix)}
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json, text/plain, */*",
-            "Referer": "https://www.a3k3c.com/",
-            "suffix": self.suffix,
-        }
-        resp = self.session.post(LOGIN_URL, json=body, headers=headers, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-        if data.get("code") != 0:
-            raise RuntimeError(f"登录失败：{data.get('msg')}")
-        plain = aes_decrypt(data["data"], data.get("suffix"))
-        parsed = json.loads(plain)["data"]
-        token = parsed.get("token")
-        if not token:
-            raise RuntimeError("登录响应缺少 token")
+    def login(self, force: bool = False) -> LoginResult:
+        """登录；配置了 token_store 时优先复用未过期的缓存 token。"""
+        if not force and self.token_store is not None:
+            cached = self.token_store.load(self.username, self.password)
+            if cached:
+                self._apply_token(cached.token)
+                self.token_from_cache = True
+                return LoginResult(token=cached.token, raw=cached.raw)
+        result = self._login_remote()
+        self.token_from_cache = False
+        if self.token_store is not None:
+            entry = CachedToken(
+                token=result.token,
+                raw=result.raw,
+                expires_at=token_expiry(result.token, self.token_ttl),
+            )
+            self.token_store.save(self.username, self.password, entry)
+        return result
+
+    def _apply_token(self, token: str) -> None:
         self.session.headers.update({"Authorization": f"Bearer {token}"})
-        return LoginResult(token=token, raw=parsed)
-
-    def fetch_categories(self) -> List[Category]:
-        resp = self.session.get(
-            CATEGORY_API,
-            params={"nocache": int(time.time() * 1000)},
-            headers={"Referer": "https://www.a3k3c.com/"},
-            timeout=15,
-        )
+
+    def _login_remote(self) -> LoginResult:
+        body, headers = build_login_request(self.username, self.password, self.suffix)
+        resp = self._request("POST", LOGIN_URL, json=body, headers=headers)
         resp.raise_for_status()
-        payload = resp.json()
-        plain = aes_decrypt(payload["data"], payload.get("suffix"))
-        data = json.loads(plain)
-        categories: List[Category] = []
-        for menu in (data.get("menus") or {}).values():
-            section = menu.get("name", "")
-            for item in menu.get("data") or []:
-                slug = item.get("jump_name")
-                channel = item.get("channel")
-                name = item.get("name")
-                if slug and channel and name:
-                    topic_id = item.get("topic_id") or (item.get("topic") or {}).get("id")
-                    categories.append(
-                        Category(
-                            section=section,
-                            name=name,
-                            channel=channel,
-                            slug=slug,
-                            topic_id=topic_id,
-                        )
-                    )
-        return categories
+        result = parse_login_response(resp.json())
+        self._apply_token(result.token)
+        return result
+
+    def _get_payload(self, url: str) -> Any:
+        """GET 加密数据接口并返回解密后的 JSON。"""
+        return self._decode(self._get_response(url).content)
+
+    def _decode(self, content: bytes) -> Any:
+        if self.metrics is None:
+            return decrypt_payload(json_loads(content))
+        return self.metrics.decode(content)
+
+    def _get_cached_payload(
+        self, endpoint: str, url: str, shape: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """取解密后的数据；写入 response_cache 前先用 shape 裁剪，只缓存需要的字段。"""
+        if self.response_cache is None:
+            return self._get_payload(url)
+        cached = self.response_cache.get(endpoint, url)
+        if cached is not None:
+            return cached
+        data = shape(self._get_payload(url))
+        self.response_cache.put(endpoint, url, data)
+        return data
+
+    def _get_response(
+        self, url: str, headers: Optional[Dict[str, str]] = None, bust_cache: bool = True
+    ) -> requests.Response:
+        """缓存 token 被拒时重新登录并重试一次；304 原样返回给调用方。"""
+        resp = self._send_get(url, headers, bust_cache)
+        if resp.status_code in AUTH_REJECTED_STATUSES and self.token_from_cache:
+            if self.token_store is not None:
+                self.token_store.discard(self.username)
+            self.login(force=True)
+            resp = self._send_get(url, headers, bust_cache)
+        resp.raise_for_status()
+        return resp
+
+    def _send_get(
+        self, url: str, headers: Optional[Dict[str, str]] = None, bust_cache: bool = True
+    ) -> requests.Response:
+        return self._request(
+            "GET",
+            url,
+            params={"nocache": int(time.time() * 1000)} if bust_cache else None,
+            headers={"Referer": "https://www.a3k3c.com/", **(headers or {})},
+        )
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """所有 HTTP 请求的唯一出口：限速、熔断、超时与重试都在这里处理。
+
+        重试耗尽后，可重试状态码的响应原样返回，由调用方 raise_for_status。
+        """
+        policy = self.retry_policy
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            self.breaker.before(host)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(url)
+            try:
+                if self.metrics is None:
+                    resp = self.session.request(method, url, timeout=policy.timeout, **kwargs)
+                else:
+                    resp = self._timed_request(method, url, policy.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self.breaker.record_failure(host)
+                if attempt >= policy.max_retries:
+                    raise
+                delay = policy.backoff(attempt)
+            else:
+                if resp.status_code not in policy.retry_statuses:
+                    self.breaker.record_success(host)
+                    return resp
+                self.breaker.record_failure(host)
+                if attempt >= policy.max_retries:
+                    return resp
+                delay = policy.retry_after(resp.headers.get("Retry-After"))
+                if delay is None:
+                    delay = policy.backoff(attempt)
+                resp.close()
+            attempt += 1
+            time.sleep(delay)
+
+    def _timed_request(self, method: str, url: str, timeout: Any, **kwargs: Any) -> requests.Response:
+        # stream=True 让 request 在收到响应头时返回，之后读取正文即为 download 阶段
+        connect_before = connect_seconds()
+        start = time.perf_counter()
+        resp = self.session.request(method, url, timeout=timeout, stream=True, **kwargs)
+        headers_at = time.perf_counter()
+        size = len(resp.content)
+        done = time.perf_counter()
+        connect = connect_seconds() - connect_before
+        self.metrics.record_response(connect, max(0.0, headers_at - start - connect), done - headers_at, size)
+        return resp
+
+    def fetch_categories(self, refresh: bool = False) -> List[Category]:
+        """经 self.catalog 缓存的分类列表；refresh=True 时强制重新拉取。"""
+        if refresh:
+            self.catalog.refresh(self)
+        return self.catalog.get(self)
+
+    def find_categories(self, identifier: str) -> List[Category]:
+        """按 jump_name 或名称（不区分大小写）查找分类，O(1) 索引查找。"""
+        self.catalog.get(self)
+        return self.catalog.lookup(identifier)
+
+    def fetch_catalog(
+        self, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> Optional[Tuple[List[Category], Optional[str], Optional[str]]]:
+        """拉取分类；带验证器时发条件请求，服务端返回 304 时得到 None。"""
+        headers: Dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        resp = self._get_response(CATEGORY_API, headers, bust_cache=not headers)
+        if resp.status_code == 304:
+            return None
+        categories = parse_categories(self._decode(resp.content))
+        return categories, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
 
     def fetch_videos_for_category(
         self, category: Category, pages: int
     ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
         if category.channel == "topic":
-            return self._fetch_topic_videos(category, pages)
-        return self._fetch_channel_videos(category.channel, category.slug, pages), None
+            videos, meta = self._fetch_topic_videos(category, pages)
+            return [video.to_dict() for video in videos], meta
+        return [video.to_dict() for video in self._fetch_channel_videos(category.channel, category.slug, pages)], None
+
+    def iter_pages(self, category: Category, pages: int) -> Iterator[VideoPage]:
+        """按页惰性产出 VideoPage，调用方可随时停止迭代；专题按 DEFAULT_PAGE_SIZE 切分为虚拟页。"""
+        if category.channel == "topic":
+            return self._iter_topic_pages(category, pages)
+        return self._iter_channel_pages(category.channel, category.slug, pages)
+
+    def iter_videos(self, category: Category, pages: int) -> Iterator[Video]:
+        for page in self.iter_pages(category, pages):
+            yield from page.videos
+
+    def crawl_categories(
+        self,
+        categories: List[Category],
+        pages: int,
+        progress: Optional[CrawlProgress] = None,
+        on_complete: Optional[Callable[[CrawlResult], None]] = None,
+    ) -> List[CrawlResult]:
+        """多分类采集：所有分类的页请求共用一个线程池，总并发受 self.concurrency 约束。
+
+        每个分类先请求第 1 页（专题为 details），拿到 last_page 后再把剩余页投入同一池子；
+        增量模式下分类内逐页请求，遇到全部见过的页即停止，并行只发生在分类之间。
+        单个分类失败只记录到 CrawlResult.error，不影响其他分类。某个分类的全部页完成后
+        立即回调 on_complete（在调用线程中执行），便于边采边写。专题详情在独立的线程池中下载，
+        并发数为 min(self.topic_concurrency, 专题数)，不受 self.concurrency 影响，
+        也不占用列表页的线程。
+        """
+        results = [CrawlResult(category=cat) for cat in categories]
+        page_items: List[Dict[int, List[Video]]] = [{} for _ in categories]
+        totals = [1] * len(categories)
+        outstanding = [0] * len(categories)
+        checkpoint = self.checkpoint
+
+        def finish(idx: int) -> None:
+            result = results[idx]
+            cat = result.category
+            if cat.channel != "topic":
+                for page in range(1, totals[idx] + 1):
+                    batch = page_items[idx].pop(page, None)
+                    if not batch:
+                        break
+                    result.videos.extend(batch)
+                if self.since_state is not None and not result.error:
+                    self.since_state.record(IncrementalState.key(cat.channel.strip(), cat.slug), result.videos)
+            if on_complete:
+                on_complete(result)
+            if checkpoint is not None and not result.error and not result.resumed:
+                checkpoint.mark_complete(CrawlCheckpoint.key(cat))
+
+        def restore(idx: int) -> None:
+            # 上次已完整写出的分类：直接从断点还原，不再请求
+            result = results[idx]
+            restored = checkpoint.pages(CrawlCheckpoint.key(result.category))
+            result.resumed = True
+            result.pages_fetched = len(restored)
+            if result.category.channel == "topic":
+                result.videos = [video for page in restored for video in page.videos]
+                result.topic_meta = restored[-1].topic_meta if restored else None
+            else:
+                for page in restored:
+                    page_items[idx][page.page] = page.videos
+                totals[idx] = max((page.page for page in restored), default=1)
+
+        topic_workers = min(self.topic_concurrency, sum(cat.channel == "topic" for cat in categories))
+        # 线程按需创建，没有专题时 topic_pool 不会启动任何线程
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool, ThreadPoolExecutor(
+            max_workers=max(1, topic_workers)
+        ) as topic_pool:
+            pending: Dict[Future, Tuple[int, int]] = {}
+
+            def submit(idx: int, page: int, fn: Callable[..., Any], *args: Any) -> None:
+                executor = topic_pool if page == 0 else pool
+                pending[executor.submit(fn, *args)] = (idx, page)
+                outstanding[idx] += 1
+
+            def schedule(idx: int, page: int) -> None:
+                cat = results[idx].category
+                restored = checkpoint.page(CrawlCheckpoint.key(cat), page) if checkpoint is not None else None
+                if restored is not None:
+                    accept(idx, restored)
+                else:
+                    submit(idx, page, self._fetch_list_page, cat.channel.strip(), cat.slug, page)
+
+            def accept(idx: int, page: VideoPage) -> None:
+                result = results[idx]
+                page_items[idx][page.page] = page.videos
+                if page.videos:
+                    if page.page == 1:
+                        totals[idx] = min(pages, page.last_page)
+                    if self.since_state is not None:
+                        # 增量模式逐页推进：本页有新条目才请求下一页，遇到全部见过的页即停止该分类
+                        if page.page < totals[idx]:
+                            schedule(idx, page.page + 1)
+                    elif page.page == 1:
+                        for next_page in range(2, totals[idx] + 1):
+                            schedule(idx, next_page)
+                result.pages_fetched += 1
+                if progress:
+                    progress(result.category, result.pages_fetched, totals[idx])
 
-    def _fetch_channel_videos(self, channel: str, slug: str, pages: int) -> List[Dict[str, Any]]:
+            for idx, cat in enumerate(categories):
+                if checkpoint is not None and checkpoint.is_complete(CrawlCheckpoint.key(cat)):
+                    restore(idx)
+                elif cat.channel == "topic":
+                    submit(idx, 0, self._fetch_topic_videos, cat, pages)
+                elif cat.channel.strip() not in SUPPORTED_CHANNELS:
+                    results[idx].error = f"当前频道暂未开放采集，channel={cat.channel}"
+                else:
+                    schedule(idx, 1)
+                if outstanding[idx] == 0:
+                    finish(idx)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx, page = pending.pop(future)
+                    outstanding[idx] -= 1
+                    result = results[idx]
+                    cat = result.category
+                    # 分类已失败时，之后成功返回的页仍记入断点，续采时只补请求失败的页
+                    if not result.error or (page and checkpoint is not None):
+                        try:
+                            value = future.result()
+                        except Exception as exc:  # noqa: BLE001
+                            result.error = result.error or str(exc)
+                        else:
+                            if page == 0:
+                                result.videos, result.topic_meta = value
+                                result.pages_fetched += 1
+                                if progress:
+                                    progress(cat, result.pages_fetched, totals[idx])
+                            else:
+                                state_key = IncrementalState.key(cat.channel.strip(), cat.slug)
+                                raw_items = value.get("data") or []
+                                items = self._unseen(state_key, raw_items)
+                                fetched = VideoPage(
+                                    page, value.get("last_page") or 1, len(raw_items), self._build_videos(items)
+                                )
+                                if checkpoint is not None:
+                                    checkpoint.record(state_key, fetched)
+                                if not result.error:
+                                    accept(idx, fetched)
+                    if outstanding[idx] == 0:
+                        finish(idx)
+        return results
+
+    def _fetch_channel_videos(self, channel: str, slug: str, pages: int) -> List[Video]:
+        items: List[Video] = []
+        for page in self._iter_channel_pages(channel, slug, pages):
+            items.extend(page.videos)
+        return items
+
+    def _iter_channel_pages(self, channel: str, slug: str, pages: int) -> Iterator[VideoPage]:
         channel_normalized = (channel or "").strip()
         if channel_normalized not in SUPPORTED_CHANNELS:
             raise ValueError(f"当前频道暂未开放采集，channel={channel_normalized}")
-        items: List[Dict[str, Any]] = []
-        for page in range(1, pages + 1):
-            encoded_slug = quote(slug, safe="")
-            url = LIST_API_TEMPLATE.format(channel=channel_normalized, slug=encoded_slug, page=page)
-            resp = self.session.get(
-                url,
-                params={"nocache": int(time.time() * 1000)},
-                headers={"Referer": "https://www.a3k3c.com/"},
-                timeout=15,
-            )
-            resp.raise_for_status()
-            payload = resp.json()
-            plain = aes_decrypt(payload["data"], payload.get("suffix"))
-            parsed = json.loads(plain)
-            page_items = (parsed.get("list") or {}).get("data") or []
+        state_key = IncrementalState.key(channel_normalized, slug)
+        current = self._resume_page(state_key, 1)
+        if current is None:
+            first = self._fetch_list_page(channel_normalized, slug, 1)
+            raw_items = first.get("data") or []
+            page_items = self._unseen(state_key, raw_items)
             if not page_items:
-                break
-            items.extend(self._format_video(item) for item in page_items)
-            last_page = (parsed.get("list") or {}).get("last_page") or 1
-            if page >= last_page:
-                break
-        return items
+                return
+            current = VideoPage(1, first.get("last_page") or 1, len(raw_items), self._format_batch(state_key, page_items))
+        yield current
+        self._checkpoint_page(state_key, current)
+        last_page = current.last_page
+        stop_page = min(pages, last_page)
+        if stop_page <= 1:
+            return
+        # 第 1 页确定 last_page 后，其余页在线程池内并发拉取，按页序产出；
+        # 增量模式需要逐页判断是否已全部见过，因此保持顺序抓取。断点中已有的页不再请求
+        remaining = range(2, stop_page + 1)
+        missing = [page for page in remaining if self.checkpoint is None or not self.checkpoint.has(state_key, page)]
+        fetch = lambda page: self._fetch_list_page(channel_normalized, slug, page)  # noqa: E731
+        pool = (
+            ThreadPoolExecutor(max_workers=min(self.concurrency, len(missing)))
+            if self.concurrency > 1 and self.since_state is None and missing
+            else None
+        )
+        try:
+            listings = iter(pool.map(fetch, missing) if pool else map(fetch, missing))
+            for page in remaining:
+                current = self._resume_page(state_key, page)
+                if current is None:
+                    raw_items = next(listings).get("data") or []
+                    page_items = self._unseen(state_key, raw_items)
+                    if not page_items:
+                        break
+                    current = VideoPage(page, last_page, len(raw_items), self._format_batch(state_key, page_items))
+                yield current
+                self._checkpoint_page(state_key, current)
+        finally:
+            if pool:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def _resume_page(self, state_key: str, page: int) -> Optional[VideoPage]:
+        """从断点恢复已完成的页；增量模式下同时把这些 id 记入状态（上次中断时未保存）。"""
+        if self.checkpoint is None:
+            return None
+        restored = self.checkpoint.page(state_key, page)
+        if restored is not None and self.since_state is not None:
+            self.since_state.record(state_key, restored.videos)
+        return restored
+
+    def _checkpoint_page(self, state_key: str, page: VideoPage) -> None:
+        # 生成器在调用方取下一页时才执行到这里，即上一页已被处理完毕
+        if self.checkpoint is not None and not page.resumed:
+            self.checkpoint.record(state_key, page)
+
+    def _format_batch(self, state_key: str, items: List[Dict[str, Any]]) -> List[Video]:
+        batch = self._build_videos(items)
+        if self.since_state is not None:
+            self.since_state.record(state_key, batch)
+        return batch
+
+    def _build_videos(self, items: List[Dict[str, Any]]) -> List[Video]:
+        if self.metrics is None:
+            return [Video.from_item(item) for item in items]
+        start = time.perf_counter()
+        videos = [Video.from_item(item) for item in items]
+        self.metrics.record_page(len(videos), time.perf_counter() - start)
+        return videos
+
+    def _fetch_list_page(self, channel: str, slug: str, page: int) -> Dict[str, Any]:
+        url = LIST_API_TEMPLATE.format(channel=channel, slug=quote(slug, safe=""), page=page)
+        return self._get_cached_payload("list", url, slim_list_payload).get("list") or {}
+
+    def _unseen(self, state_key: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self.since_state is None:
+            return items
+        known = self.since_state.known_ids(state_key)
+        return [item for item in items if item.get("id") not in known]
 
     def _fetch_topic_videos(
         self, category: Category, pages: int
-    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    ) -> Tuple[List[Video], Dict[str, Any]]:
+        videos: List[Video] = []
+        meta: Dict[str, Any] = {}
+        for page in self._iter_topic_pages(category, pages):
+            videos.extend(page.videos)
+            meta = page.topic_meta or meta
+        return videos, meta
+
+    def _iter_topic_pages(self, category: Category, pages: int) -> Iterator[VideoPage]:
         if not category.topic_id:
             raise ValueError(f"未检测到 {category.name} 的 topic_id，无法采集")
-        resp = self.session.get(
-            TOPIC_DETAILS_API.format(topic_id=category.topic_id),
-            params={"nocache": int(time.time() * 1000)},
-            headers={"Referer": "https://www.a3k3c.com/"},
-            timeout=15,
-        )
-        resp.raise_for_status()
-        payload = resp.json()
-        plain = aes_decrypt(payload["data"], payload.get("suffix"))
-        data = json.loads(plain)
-        topic_info = data.get("list") or {}
-        raw_items = topic_info.get("list") or []
-        limit = min(len(raw_items), pages * DEFAULT_PAGE_SIZE)
-        videos = [self._format_video(item) for item in raw_items[:limit]]
-        meta = {
-            "title": topic_info.get("title"),
-            "desc": topic_info.get("desc"),
-            "price": topic_info.get("price"),
-            "vip_price": topic_info.get("vip_price"),
-            "gif_images": topic_info.get("gif_images"),
-            "cover": topic_info.get("cover"),
-            "phone_cover": topic_info.get("phone_cover"),
-            "file": topic_info.get("file"),
-            "free_videos_id": topic_info.get("free_videos_id"),
-        }
-        return videos, meta
+        state_key = IncrementalState.key("topic", str(category.topic_id))
+        known_last = self.checkpoint.last_page(state_key) if self.checkpoint is not None else None
+        if known_last is not None and all(
+            self.checkpoint.has(state_key, page) for page in range(1, min(pages, known_last) + 1)
+        ):
+            # 断点已覆盖所需的全部虚拟页，无需再请求专题详情
+            for page in range(1, min(pages, known_last) + 1):
+                yield self._resume_page(state_key, page)
+            return
+        raw_items, meta = self._fetch_topic_details(category.topic_id)
+        last_page = max(1, -(-len(raw_items) // DEFAULT_PAGE_SIZE))
+        for page in range(1, min(pages, last_page) + 1):
+            current = self._resume_page(state_key, page)
+            if current is None:
+                chunk = raw_items[(page - 1) * DEFAULT_PAGE_SIZE : page * DEFAULT_PAGE_SIZE]
+                videos = self._format_batch(state_key, self._unseen(state_key, chunk))
+                current = VideoPage(page, last_page, len(chunk), videos, meta)
+            yield current
+            self._checkpoint_page(state_key, current)
+
+    def _fetch_topic_details(self, topic_id: Any) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        url = TOPIC_DETAILS_API.format(topic_id=topic_id)
+        topic_info = self._get_cached_payload("topic", url, slim_topic_payload).get("list") or {}
+        return topic_info.get("list") or [], topic_meta(topic_info)
+
+    def crawl_topics(
+        self,
+        pages: int,
+        progress: Optional[CrawlProgress] = None,
+        on_complete: Optional[Callable[[CrawlResult], None]] = None,
+    ) -> List[CrawlResult]:
+        """采集分类目录中的全部专题（按 topic_id 去重），详情并发数受 topic_concurrency 限制。"""
+        return self.crawl_categories(topic_categories(self.fetch_categories()), pages, progress, on_complete)
 
     def _format_video(self, item: Dict[str, Any]) -> Dict[str, Any]:
-        return {
-            "id": item.get("id"),
-            "title": item.get("title"),
-            "description": item.get("description"),
-            "tags": item.get("tags"),
-            "duration_seconds": item.get("duration"),
-            "duration_hms": seconds_to_hms(item.get("duration")),
-            "insert_time": item.get("insert_time"),
-            "update_time": item.get("update_time"),
-            "detail_url": DETAIL_TEMPLATE.format(id=item.get("id")),
-            "video_hls": urljoin_like(STREAM_HOST, item.get("video_url", "")),
-            "video_mp4": urljoin_like(STREAM_HOST, item.get("down_url", "")),
-            "thumb_url": normalize_thumb(item.get("thumb")),
-            "preview_url": urljoin_like(STREAM_HOST, item.get("preview", "")),
+        return Video.from_item(item).to_dict()
+
+
+def build_login_request(
+    username: str, password: str, suffix: str
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    payload: Dict[str, Any] = {
+        "system": 1,
+        "timestamp": int(time.time() * 1000),
+        "device": "pc",
+        "username": username,
+        "password": password,
+        "phone_code": "+86",
+        "phone": 0,
+    }
+    payload["encode_sign"] = base64_sign(payload)
+    body = {"post-data": aes_encrypt(json.dumps(payload, separators=(",", ":")), suffix)}
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": "application/json, text/plain, */*",
+        "Referer": "https://www.a3k3c.com/",
+        "suffix": suffix,
+    }
+    return body, headers
+
+
+def parse_login_response(data: Dict[str, Any]) -> LoginResult:
+    if data.get("code") != 0:
+        raise RuntimeError(f"登录失败：{data.get('msg')}")
+    plain = aes_decrypt(data["data"], data.get("suffix"))
+    parsed = json.loads(plain)["data"]
+    token = parsed.get("token")
+    if not token:
+        raise RuntimeError("登录响应缺少 token")
+    return LoginResult(token=token, raw=parsed)
+
+
+def decrypt_payload(payload: Dict[str, Any]) -> Any:
+    return json_loads(CRYPTO.decrypt(payload["data"], payload.get("suffix")))
+
+
+def project_video_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """只保留 _format_video 需要的字段，降低缓存条目的内存与磁盘占用。"""
+    return [{key: item[key] for key in VIDEO_SOURCE_FIELDS if key in item} for item in items]
+
+
+def slim_list_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    listing = data.get("list") or {}
+    return {
+        "list": {
+            "data": project_video_items(listing.get("data") or []),
+            "last_page": listing.get("last_page"),
         }
+    }
+
+
+def slim_topic_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    topic_info = data.get("list") or {}
+    slim = {key: topic_info.get(key) for key in TOPIC_META_FIELDS}
+    slim["list"] = project_video_items(topic_info.get("list") or [])
+    return {"list": slim}
+
+
+def is_supported(category: Category) -> bool:
+    return category.channel in SUPPORTED_CHANNELS or category.channel == "topic"
+
+
+def topic_categories(categories: List[Category]) -> List[Category]:
+    """目录中的全部专题；同一 topic_id 出现在多个分区时只保留第一个。"""
+    seen: Set[Any] = set()
+    topics: List[Category] = []
+    for cat in categories:
+        if cat.channel == "topic" and cat.topic_id and cat.topic_id not in seen:
+            seen.add(cat.topic_id)
+            topics.append(cat)
+    return topics
+
+
+def build_category_index(categories: List[Category]) -> Dict[str, List[Category]]:
+    index: Dict[str, List[Category]] = {}
+    for cat in categories:
+        for key in dict.fromkeys((cat.slug.lower(), cat.name.lower())):
+            index.setdefault(key, []).append(cat)
+    return index
+
+
+def resolve_crawl_targets(categories: List[Category], spec: str) -> List[Category]:
+    """解析 --crawl：逗号分隔的分类名/jump_name、分区名（section），或 all / topics（全部专题）。"""
+    targets: List[Category] = []
+    index = build_category_index(categories)
+    for token in (part.strip() for part in spec.split(",")):
+        if not token:
+            continue
+        if token.lower() == "all":
+            topics = topic_categories(categories)
+            matched = [cat for cat in categories if is_supported(cat) and (cat.channel != "topic" or cat in topics)]
+        elif token.lower() == "topics":
+            matched = topic_categories(categories)
+        else:
+            matched = index.get(token.lower(), [])
+            if len(matched) > 1:
+                names = ", ".join(f"{cat.section}/{cat.name}" for cat in matched)
+                raise RuntimeError(f"匹配到多个分类：{names}，请改用 jump_name 精确指定")
+            if not matched:
+                matched = [
+                    cat
+                    for cat in categories
+                    if cat.section.lower() == token.lower() and is_supported(cat)
+                ]
+            if not matched:
+                raise RuntimeError(f"未找到分类或分区：{token}。可运行 --list-categories 查看可选项。")
+        targets.extend(cat for cat in matched if cat not in targets)
+    return targets
+
+
+def parse_categories(data: Dict[str, Any]) -> List[Category]:
+    categories: List[Category] = []
+    for menu in (data.get("menus") or {}).values():
+        section = menu.get("name", "")
+        for item in menu.get("data") or []:
+            slug = item.get("jump_name")
+            channel = item.get("channel")
+            name = item.get("name")
+            if slug and channel and name:
+                topic_id = item.get("topic_id") or (item.get("topic") or {}).get("id")
+                categories.append(
+                    Category(
+                        section=section,
+                        name=name,
+                        channel=channel,
+                        slug=slug,
+                        topic_id=topic_id,
+                    )
+                )
+    return categories
+
+
+def topic_meta(topic_info: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: topic_info.get(key) for key in TOPIC_META_FIELDS}
 
 
 def seconds_to_hms(value: Any) -> str:
@@ -294,21 +1857,89 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("-u", "--username", default=os.environ.get("MAOMI_USERNAME"), help="登录用户名（默认读取环境变量 MAOMI_USERNAME）")
     parser.add_argument("-p", "--password", default=os.environ.get("MAOMI_PASSWORD"), help="登录密码（默认读取环境变量 MAOMI_PASSWORD）")
     parser.add_argument("-c", "--category", help="要抓取的分类名称或 jump_name（如 猫咪推荐 或 mmtj）")
+    parser.add_argument(
+        "--crawl",
+        help="批量采集：逗号分隔的分类名/jump_name、分区名，all（全部受支持分类）或 topics（全部专题），共用一次登录与一个线程池",
+    )
     parser.add_argument("-P", "--pages", type=int, default=1, help="抓取页数（>=1，默认 1）")
     parser.add_argument("--list-categories", action="store_true", help="仅列出可用分类，不执行抓取")
     parser.add_argument("-o", "--output", help="结果写入指定文件（UTF-8 JSON），不指定则输出到控制台")
+    parser.add_argument(
+        "--format",
+        choices=("json", "jsonl"),
+        default="json",
+        help="输出格式：json 为单个文档；jsonl 逐页流式写出（首行 header、末行 trailer 记录）",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=EXPORT_FORMATS,
+        help="改为导出纯视频记录到 --output：压缩 JSONL、CSV 或列式 parquet，逐页流式写出（zstd 需 zstandard，parquet 需 pyarrow）",
+    )
+    parser.add_argument("--db", help="同时写入本地 SQLite 数据库（按 id upsert，记录分类归属与标签）")
+    parser.add_argument("--cache-dir", help="列表页 / 专题详情的磁盘响应缓存目录（存解密后的 JSON，按 TTL 过期）")
+    parser.add_argument("--checkpoint", help="断点文件：逐页记录已完成的页与视频，中断后可配合 --resume 续采")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="从 --checkpoint 续采：跳过已完成的页，jsonl 输出与数据库追加写入；全部完成后删除断点文件",
+    )
+    parser.add_argument("--since-state", help="增量采集状态文件：只输出上次之后的新视频，翻到整页已知即停止")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="列表页并发拉取数（默认 1，即逐页顺序抓取）")
+    parser.add_argument(
+        "--topic-concurrency",
+        type=int,
+        default=DEFAULT_TOPIC_CONCURRENCY,
+        help=f"批量采集时同时下载的专题详情数（默认 {DEFAULT_TOPIC_CONCURRENCY}，使用独立线程池，与 --concurrency 无关）",
+    )
+    parser.add_argument("--pool-size", type=int, help="每个域名保持的 keep-alive 连接数（默认 max(10, --concurrency + --topic-concurrency)）")
+    parser.add_argument("--no-keepalive", action="store_true", help="关闭连接复用，每个请求后断开")
+    parser.add_argument("--dns-cache", type=float, default=0.0, metavar="TTL", help="进程内缓存 DNS 解析结果的秒数（默认不缓存）")
+    parser.add_argument("--http2", action="store_true", help='改用 httpx 的 HTTP/2 后端（需 pip install "httpx[http2]"）')
+    parser.add_argument("--rps", type=float, help="每个域名每秒最多请求数（默认不限）")
+    parser.add_argument("--retries", type=int, default=RetryPolicy.max_retries, help="5xx / 超时等可重试错误的最大重试次数（默认 3）")
+    parser.add_argument("--timeout", type=float, default=RetryPolicy.read_timeout, help="单次请求读超时秒数（默认 15）")
+    parser.add_argument("--stats", action="store_true", help="结束时在 stderr 打印各阶段耗时、字节数与吞吐统计")
+    parser.add_argument(
+        "--token-cache",
+        nargs="?",
+        const=DEFAULT_TOKEN_CACHE,
+        help=f"启用加密的本地 token 缓存，避免重复登录（默认路径 {DEFAULT_TOKEN_CACHE}）",
+    )
     args = parser.parse_args()
     if not args.username or not args.password:
         parser.error("必须提供用户名与密码（参数或环境变量）")
     if args.pages < 1:
         parser.error("--pages 必须 >= 1")
-    if not args.list_categories and not args.category:
-        parser.error("请使用 --category 指定分类，或先用 --list-categories 查看可选项")
+    if args.concurrency < 1:
+        parser.error("--concurrency 必须 >= 1")
+    if args.topic_concurrency < 1:
+        parser.error("--topic-concurrency 必须 >= 1")
+    if args.pool_size is not None and args.pool_size < 1:
+        parser.error("--pool-size 必须 >= 1")
+    if args.dns_cache < 0:
+        parser.error("--dns-cache 必须 >= 0")
+    if args.retries < 0:
+        parser.error("--retries 必须 >= 0")
+    if args.timeout <= 0:
+        parser.error("--timeout 必须 > 0")
+    if args.rps is not None and args.rps <= 0:
+        parser.error("--rps 必须 > 0")
+    if args.resume and not args.checkpoint:
+        parser.error("--resume 需要同时指定 --checkpoint")
+    if args.output_format and not args.list_categories:
+        if not args.output:
+            parser.error("--output-format 需要同时指定 --output")
+        if args.format != "json":
+            parser.error("--output-format 与 --format jsonl 不能同时使用")
+        if args.resume:
+            parser.error("--output-format 的压缩 / 列式文件无法续写，不支持 --resume")
+    if not args.list_categories and not args.category and not args.crawl:
+        parser.error("请使用 --category 或 --crawl 指定分类，或先用 --list-categories 查看可选项")
     return args
 
 
 def write_output(data: Any, output_path: Optional[str]) -> None:
-    text = json.dumps(data, ensure_ascii=False, indent=2)
+    text = json.dumps(data, ensure_ascii=False, indent=2, default=json_default)
     if output_path:
         with open(output_path, "w", encoding="utf-8") as file:
             file.write(text)
@@ -317,9 +1948,257 @@ def write_output(data: Any, output_path: Optional[str]) -> None:
         print(text)
 
 
+def open_store(path: str) -> Any:
+    from maomi_store import VideoStore
+
+    return VideoStore(path)
+
+
+@contextmanager
+def open_output(output_path: Optional[str], resume_offset: Optional[int] = None) -> Iterator[TextIO]:
+    """resume_offset 不为空时续写已有文件：先截断到该位置，丢弃中断时写了一半的内容。"""
+    if not output_path:
+        yield sys.stdout
+        return
+    if resume_offset is None:
+        file = open(output_path, "w", encoding="utf-8")
+    else:
+        try:
+            file = open(output_path, "r+", encoding="utf-8")
+        except FileNotFoundError:
+            raise RuntimeError(f"找不到要续写的输出文件：{output_path}") from None
+        file.seek(resume_offset)
+        file.truncate()
+    with file:
+        yield file
+    print(f"结果已写入 {output_path}")
+
+
+def mark_output(stream: TextIO, checkpoint: Optional[CrawlCheckpoint]) -> None:
+    """flush 后把已完整写出的位置记到断点里，随下一条断点记录落盘。"""
+    stream.flush()
+    if checkpoint is not None and stream is not sys.stdout:
+        checkpoint.output_offset = stream.tell()
+
+
+def write_jsonl(stream: TextIO, record: Dict[str, Any]) -> None:
+    stream.write(json.dumps(record, ensure_ascii=False))
+    stream.write("\n")
+
+
+def category_info(category: Category) -> Dict[str, Any]:
+    return {
+        "section": category.section,
+        "name": category.name,
+        "jump_name": category.slug,
+        "channel": category.channel,
+    }
+
+
+def crawl_result_info(result: CrawlResult) -> Dict[str, Any]:
+    return {
+        **category_info(result.category),
+        "pages_fetched": result.pages_fetched,
+        "videos_found": len(result.videos),
+        "topic_meta": result.topic_meta,
+        "error": result.error,
+    }
+
+
+def resolve_single_target(client: MaomiClient, identifier: str) -> Category:
+    matched = client.find_categories(identifier)
+    if not matched:
+        raise RuntimeError(f"未找到分类：{identifier}。可运行 --list-categories 查看可选项。")
+    if len(matched) > 1:
+        names = ", ".join(f"{cat.section}/{cat.name}" for cat in matched)
+        raise RuntimeError(f"匹配到多个分类：{names}，请改用 jump_name 精确指定")
+    return matched[0]
+
+
+def run_single_json(
+    client: MaomiClient, target: Category, args: argparse.Namespace, account: Dict[str, Any], store: Any
+) -> None:
+    videos, meta = client.fetch_videos_for_category(target, args.pages)
+    result = {
+        "account": account,
+        "category": {
+            **category_info(target),
+            "pages_requested": args.pages,
+            "videos_found": len(videos),
+            "topic_meta": meta,
+        },
+        "videos": videos,
+    }
+    write_output(result, args.output)
+    if store is not None:
+        store.upsert_videos(videos, target)
+
+
+def run_single_jsonl(
+    client: MaomiClient, target: Category, args: argparse.Namespace, account: Dict[str, Any], store: Any
+) -> None:
+    checkpoint = client.checkpoint
+    resume_offset = checkpoint.output_offset if checkpoint is not None and args.resume else None
+    with open_output(args.output, resume_offset) as stream:
+        if resume_offset is None:
+            header = {**category_info(target), "pages_requested": args.pages}
+            write_jsonl(stream, {"record": "header", "account": account, "category": header})
+            mark_output(stream, checkpoint)
+        found = 0
+        meta: Optional[Dict[str, Any]] = None
+        for page in client.iter_pages(target, args.pages):
+            found += len(page.videos)
+            meta = page.topic_meta
+            if page.resumed:
+                continue  # 上次已写出并入库
+            for video in page.videos:
+                write_jsonl(stream, video.to_dict())
+            mark_output(stream, checkpoint)
+            if store is not None:
+                store.upsert_videos(page.videos, target)
+        write_jsonl(stream, {"record": "trailer", "videos_found": found, "topic_meta": meta})
+
+
+def report_crawl_failure(result: CrawlResult) -> None:
+    cat = result.category
+    print(f"[{cat.section}/{cat.name}] 采集失败：{result.error}", file=sys.stderr)
+
+
+def run_crawl_json(
+    client: MaomiClient, targets: List[Category], args: argparse.Namespace, account: Dict[str, Any], store: Any
+) -> List[CrawlResult]:
+    results = client.crawl_categories(targets, args.pages, progress=report_crawl_progress)
+    write_output(
+        {
+            "account": account,
+            "pages_requested": args.pages,
+            "categories": [{**crawl_result_info(res), "videos": res.videos} for res in results],
+        },
+        args.output,
+    )
+    if store is not None:
+        for res in results:
+            if not res.error:
+                store.upsert_videos(res.videos, res.category)
+    return results
+
+
+def run_crawl_jsonl(
+    client: MaomiClient, targets: List[Category], args: argparse.Namespace, account: Dict[str, Any], store: Any
+) -> List[CrawlResult]:
+    checkpoint = client.checkpoint
+    resume_offset = checkpoint.output_offset if checkpoint is not None and args.resume else None
+    with open_output(args.output, resume_offset) as stream:
+        if resume_offset is None:
+            write_jsonl(stream, {"record": "header", "account": account, "pages_requested": args.pages})
+            mark_output(stream, checkpoint)
+        totals = {"categories": 0, "videos_found": 0, "failed": 0}
+
+        def emit(result: CrawlResult) -> None:
+            # 每个分类采集完即写出：分类记录后紧跟它的视频行；断点中已写出的分类只计数。
+            # 失败的分类不写出，output_offset 也不前移，续采时整个分类重新写出
+            if result.error:
+                report_crawl_failure(result)
+                totals["failed"] += 1
+                result.videos = []
+                return
+            if not result.resumed:
+                write_jsonl(stream, {"record": "category", **crawl_result_info(result)})
+                for video in result.videos:
+                    write_jsonl(stream, video.to_dict())
+                mark_output(stream, checkpoint)
+                if store is not None:
+                    store.upsert_videos(result.videos, result.category)
+            totals["categories"] += 1
+            totals["videos_found"] += len(result.videos)
+            result.videos = []
+
+        results = client.crawl_categories(targets, args.pages, progress=report_crawl_progress, on_complete=emit)
+        write_jsonl(stream, {"record": "trailer", **totals})
+    return results
+
+
+def run_single_export(
+    client: MaomiClient, target: Category, args: argparse.Namespace, account: Dict[str, Any], store: Any
+) -> None:
+    from maomi_export import export_file
+
+    with export_file(args.output, args.output_format) as exporter:
+        for page in client.iter_pages(target, args.pages):
+            exporter.write(page.videos)
+            if store is not None:
+                store.upsert_videos(page.videos, target)
+    print(f"已导出 {exporter.rows} 条视频到 {args.output}（{args.output_format}）")
+
+
+def run_crawl_export(
+    client: MaomiClient, targets: List[Category], args: argparse.Namespace, account: Dict[str, Any], store: Any
+) -> List[CrawlResult]:
+    from maomi_export import export_file
+
+    with export_file(args.output, args.output_format) as exporter:
+
+        def emit(result: CrawlResult) -> None:
+            # 失败分类只有部分页，导出行无法标记出错，因此不写出
+            if result.error:
+                report_crawl_failure(result)
+            else:
+                exporter.write(result.videos)
+                if store is not None:
+                    store.upsert_videos(result.videos, result.category)
+            result.videos = []
+
+        results = client.crawl_categories(targets, args.pages, progress=report_crawl_progress, on_complete=emit)
+    print(f"已导出 {exporter.rows} 条视频到 {args.output}（{args.output_format}）")
+    return results
+
+
+def format_stats(summary: Dict[str, Any]) -> str:
+    lines = [
+        "== 采集统计 ==",
+        f"请求 {summary['requests']} 次，接收 {summary['bytes_in'] / 1024 / 1024:.2f} MB，用时 {summary['elapsed_s']:.2f} s；"
+        f"页 {summary['pages']}（{summary['pages_per_s']:.1f} 页/s），视频 {summary['items']}（{summary['items_per_s']:.1f} 条/s）",
+        f"{'phase':<10}{'count':>8}{'total_s':>10}{'mean_ms':>10}{'p50_ms':>10}{'p90_ms':>10}{'p99_ms':>10}",
+    ]
+    for name, phase in summary["phases"].items():
+        lines.append(
+            f"{name:<10}{phase['count']:>8}{phase['total_s']:>10.3f}{phase['mean_ms']:>10.2f}"
+            f"{phase['p50_ms']:>10.2f}{phase['p90_ms']:>10.2f}{phase['p99_ms']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def report_crawl_progress(category: Category, done: int, total: int) -> None:
+    print(f"[{category.section}/{category.name}] 已完成 {done}/{total} 页", file=sys.stderr)
+
+
 def main() -> None:
     args = parse_args()
-    client = MaomiClient(args.username, args.password)
+    token_store = FileTokenStore(args.token_cache) if args.token_cache else None
+    since_state = IncrementalState(args.since_state) if args.since_state else None
+    client = MaomiClient(
+        args.username,
+        args.password,
+        token_store=token_store,
+        concurrency=args.concurrency,
+        topic_concurrency=args.topic_concurrency,
+        rate_limit=args.rps,
+        since_state=since_state,
+        response_cache=ResponseCache(disk_dir=args.cache_dir) if args.cache_dir else None,
+        retry_policy=RetryPolicy(max_retries=args.retries, read_timeout=args.timeout),
+        transport=TransportConfig(
+            pool_size=args.pool_size,
+            keepalive=not args.no_keepalive,
+            dns_cache_ttl=args.dns_cache,
+            http2=args.http2,
+        ),
+        metrics=ClientMetrics() if args.stats else None,
+        checkpoint=(
+            CrawlCheckpoint(args.checkpoint, resume=args.resume)
+            if args.checkpoint and not args.list_categories
+            else None
+        ),
+    )
     login_res = client.login()
     categories = client.fetch_categories()
 
@@ -331,46 +2210,57 @@ def main() -> None:
                 "jump_name": cat.slug,
                 "channel": cat.channel,
                 "topic_id": cat.topic_id,
-                "supported": cat.channel in SUPPORTED_CHANNELS or cat.channel == "topic",
+                "supported": is_supported(cat),
             }
             for cat in categories
         ]
         write_output(catalog, args.output)
         return
 
-    identifier = args.category.strip().lower()
-    matched = [
-        cat
-        for cat in categories
-        if cat.slug.lower() == identifier or cat.name.lower() == identifier
-    ]
-    if not matched:
-        raise RuntimeError(f"未找到分类：{args.category}。可运行 --list-categories 查看可选项。")
-    if len(matched) > 1:
-        names = ", ".join(f"{cat.section}/{cat.name}" for cat in matched)
-        raise RuntimeError(f"匹配到多个分类：{names}，请改用 jump_name 精确指定")
-    target = matched[0]
-
-    videos, topic_meta = client.fetch_videos_for_category(target, args.pages)
-    result = {
-        "account": {
-            "username": args.username,
-            "vip_level": login_res.raw.get("vip_level"),
-            "is_vip": login_res.raw.get("is_vip"),
-            "token": login_res.token,
-        },
-        "category": {
-            "section": target.section,
-            "name": target.name,
-            "jump_name": target.slug,
-            "channel": target.channel,
-            "pages_requested": args.pages,
-            "videos_found": len(videos),
-            "topic_meta": topic_meta,
-        },
-        "videos": videos,
+    account = {
+        "username": args.username,
+        "vip_level": login_res.raw.get("vip_level"),
+        "is_vip": login_res.raw.get("is_vip"),
+        "token": login_res.token,
     }
-    write_output(result, args.output)
+    store = open_store(args.db) if args.db else None
+    failed: List[CrawlResult] = []
+    try:
+        if args.crawl:
+            targets = resolve_crawl_targets(categories, args.crawl)
+            if args.output_format:
+                results = run_crawl_export(client, targets, args, account, store)
+            elif args.format == "jsonl":
+                results = run_crawl_jsonl(client, targets, args, account, store)
+            else:
+                results = run_crawl_json(client, targets, args, account, store)
+            failed = [res for res in results if res.error]
+        else:
+            target = resolve_single_target(client, args.category)
+            if args.output_format:
+                run_single_export(client, target, args, account, store)
+            elif args.format == "jsonl":
+                run_single_jsonl(client, target, args, account, store)
+            else:
+                run_single_json(client, target, args, account, store)
+        if store is not None:
+            print(f"已写入数据库 {args.db}：库内共 {store.count()} 条", file=sys.stderr)
+    finally:
+        if store is not None:
+            store.close()
+        if client.checkpoint is not None:
+            client.checkpoint.close()
+        if client.metrics is not None:
+            print(format_stats(client.metrics.summary()), file=sys.stderr)
+    if since_state is not None:
+        since_state.save()
+    if failed:
+        # 有分类失败时保留断点，以非零状态退出，便于 --resume 只补采失败的分类
+        names = "、".join(f"{res.category.section}/{res.category.name}" for res in failed)
+        hint = "，断点已保留，可加 --resume 续采" if client.checkpoint is not None else ""
+        raise RuntimeError(f"{len(failed)} 个分类采集失败：{names}{hint}")
+    if client.checkpoint is not None:
+        client.checkpoint.discard()
 
 
 if __name__ == "__main__":
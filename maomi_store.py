@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地 SQLite 存储
+
+- videos：以 id 为主键 upsert `_format_video` 的输出，记录首次/最近采集时间。
+- categories / video_categories：记录视频所属分类（section、jump_name、channel、topic_id）。
+- video_tags：拆分后的标签，便于按标签检索。
+- 索引覆盖 update_time、duration_seconds 与 tag；写入按批次放在事务中执行。
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from maomi_spider import Category, Video
+
+DEFAULT_BATCH_SIZE = 500
+
+VIDEO_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "tags",
+    "duration_seconds",
+    "duration_hms",
+    "insert_time",
+    "update_time",
+    "detail_url",
+    "video_hls",
+    "video_mp4",
+    "thumb_url",
+    "preview_url",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    title TEXT,
+    description TEXT,
+    tags TEXT,
+    duration_seconds INTEGER,
+    duration_hms TEXT,
+    insert_time INTEGER,
+    update_time INTEGER,
+    detail_url TEXT,
+    video_hls TEXT,
+    video_mp4 TEXT,
+    thumb_url TEXT,
+    preview_url TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    section TEXT,
+    name TEXT,
+    slug TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    topic_id INTEGER,
+    UNIQUE (channel, slug)
+);
+CREATE TABLE IF NOT EXISTS video_categories (
+    video_id INTEGER NOT NULL REFERENCES videos(id),
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    PRIMARY KEY (video_id, category_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS video_tags (
+    video_id INTEGER NOT NULL REFERENCES videos(id),
+    tag TEXT NOT NULL,
+    PRIMARY KEY (video_id, tag)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_videos_update_time ON videos (update_time);
+CREATE INDEX IF NOT EXISTS idx_videos_duration ON videos (duration_seconds);
+CREATE INDEX IF NOT EXISTS idx_video_tags_tag ON video_tags (tag);
+CREATE INDEX IF NOT EXISTS idx_video_categories_category ON video_categories (category_id);
+"""
+
+UPSERT_VIDEO_SQL = f"""
+INSERT INTO videos ({", ".join(VIDEO_COLUMNS)}, first_seen, last_seen)
+VALUES ({", ".join("?" for _ in VIDEO_COLUMNS)}, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    {", ".join(f"{col} = excluded.{col}" for col in VIDEO_COLUMNS if col != "id")},
+    last_seen = excluded.last_seen
+"""
+
+
+def split_tags(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        parts = [str(tag) for tag in value]
+    else:
+        parts = str(value).replace("，", ",").split(",")
+    return list(dict.fromkeys(tag.strip() for tag in parts if tag.strip()))
+
+
+def tags_text(value: Any) -> Optional[str]:
+    """tags 列按逗号分隔的字符串存储；列表形式的标签先拼接，字符串原样保留。"""
+    if value is None or isinstance(value, str):
+        return value
+    return ",".join(split_tags(value))
+
+
+def video_row(video: Dict[str, Any]) -> Tuple[Any, ...]:
+    return tuple(tags_text(video.get(col)) if col == "tags" else video.get(col) for col in VIDEO_COLUMNS)
+
+
+class VideoStore:
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "VideoStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def upsert_category(self, category: Category) -> int:
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO categories (section, name, slug, channel, topic_id)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(channel, slug) DO UPDATE SET
+                    section = excluded.section, name = excluded.name, topic_id = excluded.topic_id
+                """,
+                (category.section, category.name, category.slug, category.channel, category.topic_id),
+            )
+        row = self.conn.execute(
+            "SELECT id FROM categories WHERE channel = ? AND slug = ?",
+            (category.channel, category.slug),
+        ).fetchone()
+        return int(row[0])
+
+    def upsert_videos(
+        self, videos: Iterable[Union[Video, Dict[str, Any]]], category: Optional[Category] = None
+    ) -> int:
+        """按批次 upsert 视频（每批一个事务），返回写入条数。"""
+        category_id = self.upsert_category(category) if category is not None else None
+        total = 0
+        batch: List[Dict[str, Any]] = []
+        for video in videos:
+            if isinstance(video, Video):
+                video = video.to_dict()
+            if video.get("id") is None:
+                continue
+            batch.append(video)
+            if len(batch) >= self.batch_size:
+                total += self._write_batch(batch, category_id)
+                batch = []
+        if batch:
+            total += self._write_batch(batch, category_id)
+        return total
+
+    def _write_batch(self, batch: List[Dict[str, Any]], category_id: Optional[int]) -> int:
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                UPSERT_VIDEO_SQL,
+                [video_row(video) + (now, now) for video in batch],
+            )
+            ids = [(video["id"],) for video in batch]
+            self.conn.executemany("DELETE FROM video_tags WHERE video_id = ?", ids)
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO video_tags (video_id, tag) VALUES (?, ?)",
+                [(video["id"], tag) for video in batch for tag in split_tags(video.get("tags"))],
+            )
+            if category_id is not None:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO video_categories (video_id, category_id) VALUES (?, ?)",
+                    [(video["id"], category_id) for video in batch],
+                )
+        return len(batch)
+
+    def count(self) -> int:
+        return int(self.conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0])
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HostCircuitBreaker：冷却结束后只放行一个试探请求，试探成功才恢复，失败立即再次熔断。
+
+运行：
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maomi_spider import CircuitOpenError, HostCircuitBreaker  # noqa: E402
+
+HOST = "api.example.com"
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 1000.0
+        patcher = mock.patch("maomi_spider.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = HostCircuitBreaker(threshold=2, cooldown=30.0)
+        self.breaker.record_failure(HOST)
+        self.breaker.record_failure(HOST)
+
+    def test_half_open_allows_a_single_probe(self) -> None:
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before(HOST)
+        self.now += 31
+        self.breaker.before(HOST)
+        for _ in range(3):
+            with self.assertRaises(CircuitOpenError):
+                self.breaker.before(HOST)
+        self.breaker.record_success(HOST)
+        self.breaker.before(HOST)
+        self.breaker.before(HOST)
+
+    def test_failed_probe_reopens(self) -> None:
+        self.now += 31
+        self.breaker.before(HOST)
+        self.breaker.record_failure(HOST)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before(HOST)
+
+    def test_unreported_probe_expires_after_cooldown(self) -> None:
+        self.now += 31
+        self.breaker.before(HOST)
+        self.now += 31
+        self.breaker.before(HOST)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before(HOST)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+--crawl 断点续采：某个分类因网络错误失败时，断点保留、进程非零退出，
+--resume 后每个分类在 jsonl 中恰好出现一次，且只补采失败分类中未完成的页。
+
+运行：
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from typing import Any, Dict, List, Optional, Set, Tuple
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import requests  # noqa: E402
+
+import maomi_spider  # noqa: E402
+from stub_server import FixtureSpec, StubServer, point_client_at  # noqa: E402
+
+PAGES = 5
+ITEMS = 20
+TARGETS = "bench0,bench1,bench2"
+
+
+class CrawlResumeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = StubServer(spec=FixtureSpec(categories=3, pages=PAGES, items=ITEMS, topics=0)).start()
+        previous = point_client_at(self.server.base_url)
+        self.addCleanup(lambda: [setattr(maomi_spider, name, value) for name, value in previous.items()])
+        self.addCleanup(self.server.stop)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.output = os.path.join(tmp.name, "crawl.jsonl")
+        self.checkpoint = os.path.join(tmp.name, "crawl.ckpt")
+        self.requested: List[Tuple[str, int]] = []
+        self.fail_on: Set[Tuple[str, int]] = set()
+
+    def run_cli(self, *extra: str) -> Optional[Exception]:
+        original = maomi_spider.MaomiClient._fetch_list_page
+
+        def fetch(client: Any, channel: str, slug: str, page: int) -> Dict[str, Any]:
+            self.requested.append((slug, page))
+            if (slug, page) in self.fail_on:
+                raise requests.ConnectionError("net down")
+            return original(client, channel, slug, page)
+
+        argv = ["maomi_spider", "-u", "u", "-p", "p", "--crawl", TARGETS, "-P", str(PAGES), "--retries", "0"]
+        argv += ["--format", "jsonl", "-o", self.output, "--checkpoint", self.checkpoint, *extra]
+        with mock.patch.object(sys, "argv", argv), mock.patch.object(
+            maomi_spider.MaomiClient, "_fetch_list_page", fetch
+        ), mock.patch("sys.stdout"), mock.patch("sys.stderr"):
+            try:
+                maomi_spider.main()
+            except Exception as exc:  # noqa: BLE001
+                return exc
+        return None
+
+    def read_records(self) -> List[Dict[str, Any]]:
+        with open(self.output, "r", encoding="utf-8") as file:
+            return [json.loads(line) for line in file]
+
+    def crawl_with_failure(self, concurrency: str) -> None:
+        self.fail_on = {("bench1", 3)}
+        error = self.run_cli("--concurrency", concurrency)
+        self.assertIsInstance(error, RuntimeError)
+        self.assertIn("基准分类1", str(error))
+        self.assertTrue(os.path.exists(self.checkpoint))
+        records = self.read_records()
+        self.assertEqual(sorted(record["jump_name"] for record in records if record.get("record") == "category"), ["bench0", "bench2"])
+        self.assertEqual(records[-1]["failed"], 1)
+
+        self.fail_on = set()
+        self.requested = []
+        self.assertIsNone(self.run_cli("--resume", "--concurrency", concurrency))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+        records = self.read_records()
+        self.assertEqual(records[0]["record"], "header")
+        categories = [record for record in records if record.get("record") == "category"]
+        self.assertEqual(sorted(record["jump_name"] for record in categories), ["bench0", "bench1", "bench2"])
+        self.assertTrue(all(record["error"] is None for record in categories))
+        videos = [record for record in records if "record" not in record]
+        self.assertEqual(len(videos), 3 * PAGES * ITEMS)
+        self.assertEqual(records[-1], {"record": "trailer", "categories": 3, "videos_found": 3 * PAGES * ITEMS, "failed": 0})
+
+    def test_sequential_resume_fetches_only_failed_page(self) -> None:
+        self.crawl_with_failure("1")
+        # bench1 其余页在失败前后都已记入断点，续采只补请求失败的第 3 页
+        self.assertEqual(self.requested, [("bench1", 3)])
+
+    def test_concurrent_resume_fetches_only_failed_page(self) -> None:
+        self.crawl_with_failure("4")
+        self.assertEqual(self.requested, [("bench1", 3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
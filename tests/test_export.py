@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+maomi_export：CSV 中列表形式的 tags 拼成逗号分隔字符串，与 SQLite 存储一致。
+
+运行：
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maomi_export import iter_export  # noqa: E402
+
+
+class CsvExportTest(unittest.TestCase):
+    def test_list_tags_are_joined(self) -> None:
+        videos = [{"id": 1, "tags": ["国产", " 剧情 ", "国产"]}, {"id": 2, "tags": "国产,剧情"}]
+        text = b"".join(iter_export(videos, "csv")).decode("utf-8")
+        rows = list(csv.DictReader(io.StringIO(text)))
+        self.assertEqual([row["tags"] for row in rows], ["国产,剧情", "国产,剧情"])
+
+
+if __name__ == "__main__":
+    unittest.main()
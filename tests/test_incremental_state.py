@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IncrementalState：逐页记录超过 MAX_KNOWN_IDS 个 id 后，截断丢弃的应是最旧的 id，
+下次运行仍能认出第 1 页。
+
+运行：
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maomi_spider import DEFAULT_PAGE_SIZE, MAX_KNOWN_IDS, IncrementalState, Video  # noqa: E402
+
+KEY = IncrementalState.key("vip", "bench")
+
+
+def page_videos(page: int, newest_id: int) -> List[Video]:
+    """列表按时间倒序：第 page 页的 id 从 newest_id 往下数。"""
+    start = newest_id - (page - 1) * DEFAULT_PAGE_SIZE
+    return [Video.from_item({"id": start - offset, "update_time": start - offset}) for offset in range(DEFAULT_PAGE_SIZE)]
+
+
+class IncrementalStateTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "state.json")
+        self.pages = MAX_KNOWN_IDS // DEFAULT_PAGE_SIZE + 3
+
+    def test_per_page_records_keep_newest_ids(self) -> None:
+        newest_id = 100000
+        state = IncrementalState(self.path)
+        for page in range(1, self.pages + 1):
+            state.record(KEY, page_videos(page, newest_id))
+        state.save()
+
+        reloaded = IncrementalState(self.path)
+        known = reloaded.known_ids(KEY)
+        self.assertEqual(len(known), MAX_KNOWN_IDS)
+        self.assertTrue({video.id for video in page_videos(1, newest_id)} <= known)
+        self.assertFalse({video.id for video in page_videos(self.pages, newest_id)} & known)
+
+    def test_next_run_puts_new_ids_before_previous_state(self) -> None:
+        state = IncrementalState(self.path)
+        for page in range(1, self.pages + 1):
+            state.record(KEY, page_videos(page, 100000))
+        state.save()
+
+        # 第二次运行：第 1 页是新内容，逐页记录与一次性整批记录结果一致
+        newest_id = 100000 + DEFAULT_PAGE_SIZE
+        per_page = IncrementalState(self.path)
+        per_page.record(KEY, page_videos(1, newest_id))
+        per_page.record(KEY, page_videos(2, newest_id))
+        batch = IncrementalState(self.path)
+        batch.record(KEY, page_videos(1, newest_id) + page_videos(2, newest_id))
+        self.assertEqual(per_page.data[KEY]["known_ids"], batch.data[KEY]["known_ids"])
+        self.assertEqual(per_page.data[KEY]["known_ids"][:DEFAULT_PAGE_SIZE], [video.id for video in page_videos(1, newest_id)])
+        self.assertEqual(per_page.data[KEY]["newest_id"], newest_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
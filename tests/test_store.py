@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VideoStore：列表形式的 tags 与逗号分隔字符串一样写入 videos.tags 与 video_tags。
+
+运行：
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maomi_spider import Category  # noqa: E402
+from maomi_store import VideoStore  # noqa: E402
+
+
+class VideoStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = VideoStore(os.path.join(tmp.name, "videos.db"))
+        self.addCleanup(self.store.close)
+
+    def test_list_tags_are_stored_as_text(self) -> None:
+        category = Category(section="视频", name="测试", channel="vip", slug="test")
+        written = self.store.upsert_videos(
+            [
+                {"id": 1, "title": "列表标签", "tags": ["国产", " 剧情 ", "国产"]},
+                {"id": 2, "title": "字符串标签", "tags": "国产，剧情"},
+            ],
+            category,
+        )
+        self.assertEqual(written, 2)
+        rows = dict(self.store.conn.execute("SELECT id, tags FROM videos ORDER BY id").fetchall())
+        self.assertEqual(rows, {1: "国产,剧情", 2: "国产，剧情"})
+        tags = self.store.conn.execute("SELECT video_id, tag FROM video_tags ORDER BY video_id, tag").fetchall()
+        self.assertEqual(tags, [(1, "剧情"), (1, "国产"), (2, "剧情"), (2, "国产")])
+
+
+if __name__ == "__main__":
+    unittest.main()
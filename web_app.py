@@ -6,13 +6,47 @@ Web 前端：在浏览器中登录、选择分类/页数、查看封面并下载
     pip install flask requests pycryptodome
     python web_app.py
 然后访问 http://127.0.0.1:5000/
+设置环境变量 MAOMI_METRICS=1 时启用采集计时，并在 /metrics 提供 Prometheus 文本格式指标。
+采集到的视频会写入本地检索索引（/api/search）；设置 MAOMI_SEARCH_DB 时启动时先载入该 SQLite 库。
 """
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
-from flask import Flask, jsonify, render_template_string, request
-from maomi_spider import MaomiClient, SUPPORTED_CHANNELS, LoginResult
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from flask import Flask, Response, jsonify, request, stream_with_context
+from maomi_export import EXPORT_CONTENT_TYPES, iter_export
+from maomi_jobs import DEFAULT_JOB_WORKERS, JOB_DONE, Job, JobManager
+from maomi_response import CachedBody, install_response_layer
+from maomi_search import DEFAULT_SEARCH_LIMIT, SearchIndex, timed_search
+from maomi_spider import (
+    Category,
+    CategoryCatalog,
+    ClientMetrics,
+    LoginResult,
+    EXPORT_FORMATS,
+    HostCircuitBreaker,
+    MaomiClient,
+    MemoryTokenStore,
+    ResponseCache,
+    RetryPolicy,
+    Video,
+    credential_fingerprint,
+    is_supported,
+    json_dumps,
+)
 
 app = Flask(__name__)
+install_response_layer(app)
+TOKEN_STORE = MemoryTokenStore()
+CATALOG = CategoryCatalog()
+RESPONSE_CACHE = ResponseCache()
+# 每个请求新建 MaomiClient，熔断状态需跨请求保留
+BREAKER = HostCircuitBreaker.from_policy(RetryPolicy())
+METRICS: Optional[ClientMetrics] = ClientMetrics() if os.environ.get("MAOMI_METRICS") else None
+JOBS = JobManager(workers=int(os.environ.get("MAOMI_JOB_WORKERS") or DEFAULT_JOB_WORKERS))
+SEARCH_INDEX = SearchIndex()
+if os.environ.get("MAOMI_SEARCH_DB"):
+    SEARCH_INDEX.load_store(os.environ["MAOMI_SEARCH_DB"])
 
 INDEX_HTML = """
 <!DOCTYPE html>
@@ -114,6 +148,12 @@ INDEX_HTML = """
       flex-wrap: wrap;
     }
     .card-actions button { flex: 1 1 120px; }
+    .virtual-viewport { position: relative; height: 70vh; overflow-y: auto; }
+    .virtual-window { position: absolute; top: 0; left: 0; right: 0; }
+    .virtual-window .card { height: 240px; overflow: hidden; }
+    .virtual-window .card-title, .virtual-window .card-meta { white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+    .card.placeholder { color: #9ca3af; justify-content: center; align-items: center; }
+    #videos-empty { color: #6b7280; }
     #status {
       background: #0b1221;
       color: #2df3a0;
@@ -182,7 +222,11 @@ INDEX_HTML = """
         <h2>视频列表</h2>
         <div id="result-counter">尚未采集</div>
       </div>
-      <div id="videos" class="cards-grid">等待采集...</div>
+      <div id="videos" class="virtual-viewport">
+        <div id="videos-empty">等待采集...</div>
+        <div id="videos-spacer"></div>
+        <div id="videos-window" class="cards-grid virtual-window"></div>
+      </div>
     </section>
     <section class="panel">
       <h2>状态 / 调试日志</h2>
@@ -201,10 +245,24 @@ INDEX_HTML = """
     </div>
   </div>
   <script>
+    // 结果保存在服务端任务中，前端只缓存已加载的卡片块，并且只渲染视口附近的几行
+    const RESULT_BLOCK = 200;
+    const CARD_MIN_WIDTH = 280;
+    const CARD_GAP = 20;
+    const CARD_ROW_HEIGHT = 260;
+    const OVERSCAN_ROWS = 3;
+    const POLL_INTERVAL = 800;
+
     const state = {
-      videos: [],
       categories: [],
       topicMeta: null,
+      resultId: null,
+      status: null,
+      total: 0,
+      blocks: new Map(),
+      pending: new Set(),
+      pollTimer: null,
+      renderQueued: false,
     };
 
     function logStatus(message, payload) {
@@ -229,13 +287,17 @@ INDEX_HTML = """
 
     async function loadCategories() {
       const payload = collectCredentialPayload(false);
-      logStatus(payload.username && payload.password ? '开始加载分类...' : '匿名加载分类...', null);
+      const anonymous = !(payload.username && payload.password);
+      logStatus(anonymous ? '匿名加载分类...' : '开始加载分类...', null);
       try {
-        const res = await fetch('/api/categories', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify(payload),
-        });
+        // 匿名目录走 GET，浏览器凭 ETag 条件请求，目录未变时服务端只回 304
+        const res = anonymous
+          ? await fetch('/api/categories')
+          : await fetch('/api/categories', {
+              method: 'POST',
+              headers: { 'Content-Type': 'application/json' },
+              body: JSON.stringify(payload),
+            });
         const data = await res.json();
         if (!res.ok) {
           alert(data.message || '加载失败');
@@ -285,7 +347,7 @@ INDEX_HTML = """
       const logLabel = credentials.username && credentials.password ? '开始采集...' : '匿名采集...';
       logStatus(logLabel, { category: category.name, pages });
       try {
-        const res = await fetch('/api/scrape', {
+        const res = await fetch('/api/jobs', {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
           body: JSON.stringify(payload),
@@ -296,19 +358,64 @@ INDEX_HTML = """
           logStatus('采集失败', data);
           return;
         }
-        state.videos = data.videos || [];
-        state.topicMeta = (data.category && data.category.topic_meta) || null;
-        renderTopicMeta(state.topicMeta);
-        renderVideos(state.videos);
-        logStatus(`采集完成，共 ${state.videos.length} 条`, {
-          channel: data.category && data.category.channel,
-        });
+        resetResults(data.id);
+        renderTopicMeta(null);
+        logStatus(data.deduplicated ? '复用进行中或已完成的同类任务' : '已提交采集任务', { id: data.id });
+        pollJob();
       } catch (error) {
         alert('采集异常：' + error);
         logStatus('采集异常', { error: String(error) });
       }
     }
 
+    function resetResults(id) {
+      clearTimeout(state.pollTimer);
+      state.resultId = id;
+      state.status = 'queued';
+      state.total = 0;
+      state.topicMeta = null;
+      state.blocks = new Map();
+      state.pending = new Set();
+      document.getElementById('videos').scrollTop = 0;
+      scheduleRender();
+    }
+
+    async function pollJob() {
+      const id = state.resultId;
+      try {
+        const res = await fetch(`/api/jobs/${id}?limit=0`);
+        const data = await res.json();
+        if (id !== state.resultId) return;
+        if (!res.ok) {
+          logStatus('任务查询失败', data);
+          return;
+        }
+        if (!state.topicMeta && data.topic_meta) {
+          state.topicMeta = data.topic_meta;
+          renderTopicMeta(state.topicMeta);
+        }
+        const progress = data.progress || {};
+        if (data.videos_found !== state.total) {
+          logStatus(`已完成 ${progress.pages_done}/${progress.pages_total || '?'} 页，累计 ${data.videos_found} 条`, null);
+        }
+        state.total = data.videos_found;
+        state.status = data.status;
+        scheduleRender();
+        if (data.status === 'done') {
+          logStatus(`采集完成，共 ${data.videos_found} 条`, null);
+          return;
+        }
+        if (data.status === 'error') {
+          alert('采集中断：' + data.error);
+          logStatus('采集中断', { error: data.error, videos_found: data.videos_found });
+          return;
+        }
+      } catch (error) {
+        logStatus('任务查询异常', { error: String(error) });
+      }
+      if (id === state.resultId) state.pollTimer = setTimeout(pollJob, POLL_INTERVAL);
+    }
+
     function renderTopicMeta(meta) {
       const panel = document.getElementById('topic-meta-panel');
       const container = document.getElementById('topic-meta');
@@ -339,50 +446,133 @@ INDEX_HTML = """
       return value;
     }
 
-    function renderVideos(list) {
-      const container = document.getElementById('videos');
+    function escapeHtml(value) {
+      return String(value).replace(/[&<>"']/g, (ch) => `&#${ch.charCodeAt(0)};`);
+    }
+
+    function updateCounter() {
       const counter = document.getElementById('result-counter');
-      if (!list.length) {
-        container.textContent = '没有匹配的视频';
-        counter.textContent = '0 条结果';
+      const empty = document.getElementById('videos-empty');
+      const running = state.status === 'queued' || state.status === 'running';
+      empty.classList.toggle('hidden', state.total > 0);
+      if (!state.total) {
+        empty.textContent = running ? '采集中...' : state.resultId ? '没有匹配的视频' : '等待采集...';
+        counter.textContent = running ? '采集中' : state.resultId ? '0 条结果' : '尚未采集';
         return;
       }
-      container.innerHTML = '';
-      counter.textContent = `共 ${list.length} 条视频`;
-      list.forEach((video, idx) => {
-        const card = document.createElement('div');
-        card.className = 'card';
-        const duration = video.duration_hms || (video.duration_seconds ? video.duration_seconds + 's' : '未知');
-        const sources = [
-          video.video_mp4 ? '<span class="badge">MP4</span>' : '',
-          video.video_m3u8 ? '<span class="badge">HLS</span>' : '',
-        ].join('');
-        card.innerHTML = `
-          <div class="card-title">${video.title || '未命名视频'}</div>
-          <div class="card-meta">ID：${video.id != null ? video.id : '-'}</div>
-          <div class="card-meta">标签：${formatTags(video.tags)}</div>
-          <div class="card-meta">时长：${duration}</div>
-          <div class="card-meta">可用流：${sources || '暂无'}</div>
-          <div class="card-actions">
-            ${video.detail_url ? `<button class="secondary" onclick="openDetail('${video.detail_url}')">原站页面</button>` : ''}
-            <button class="primary" onclick="showVideoJson(${idx})">详情(JSON)</button>
-          </div>
-        `;
-        container.appendChild(card);
+      counter.textContent = `共 ${state.total} 条视频${running ? '（采集中）' : ''}`;
+    }
+
+    function scheduleRender() {
+      if (state.renderQueued) return;
+      state.renderQueued = true;
+      requestAnimationFrame(() => {
+        state.renderQueued = false;
+        renderViewport();
       });
     }
 
+    function renderViewport() {
+      const viewport = document.getElementById('videos');
+      const spacer = document.getElementById('videos-spacer');
+      const grid = document.getElementById('videos-window');
+      updateCounter();
+      const columns = Math.max(1, Math.floor((viewport.clientWidth + CARD_GAP) / (CARD_MIN_WIDTH + CARD_GAP)));
+      const rows = Math.ceil(state.total / columns);
+      spacer.style.height = `${rows * CARD_ROW_HEIGHT}px`;
+      const firstRow = Math.max(0, Math.floor(viewport.scrollTop / CARD_ROW_HEIGHT) - OVERSCAN_ROWS);
+      const lastRow = Math.min(rows, Math.ceil((viewport.scrollTop + viewport.clientHeight) / CARD_ROW_HEIGHT) + OVERSCAN_ROWS);
+      grid.style.gridTemplateColumns = `repeat(${columns}, minmax(0, 1fr))`;
+      grid.style.transform = `translateY(${firstRow * CARD_ROW_HEIGHT}px)`;
+      const fragment = document.createDocumentFragment();
+      const end = Math.min(state.total, lastRow * columns);
+      for (let idx = firstRow * columns; idx < end; idx++) {
+        fragment.appendChild(buildVideoCard(videoAt(idx), idx));
+      }
+      grid.replaceChildren(fragment);
+    }
+
+    function videoAt(index) {
+      const block = Math.floor(index / RESULT_BLOCK);
+      const rows = state.blocks.get(block);
+      // 采集中最后一块可能不满，总数增长后需要重新拉取
+      const complete = rows && (rows.length === RESULT_BLOCK || block * RESULT_BLOCK + rows.length >= state.total);
+      if (!complete) fetchBlock(block);
+      return rows ? rows[index - block * RESULT_BLOCK] : null;
+    }
+
+    async function fetchBlock(block) {
+      const id = state.resultId;
+      if (!id || state.pending.has(block)) return;
+      const pending = state.pending;
+      pending.add(block);
+      try {
+        const res = await fetch(`/api/results/${id}?offset=${block * RESULT_BLOCK}&limit=${RESULT_BLOCK}`);
+        const data = await res.json();
+        if (id !== state.resultId) return;
+        if (!res.ok) {
+          logStatus('结果加载失败', data);
+          return;
+        }
+        state.blocks.set(block, data.videos);
+        scheduleRender();
+      } catch (error) {
+        logStatus('结果加载异常', { error: String(error) });
+      } finally {
+        pending.delete(block);
+      }
+    }
+
+    function buildVideoCard(video, idx) {
+      const card = document.createElement('div');
+      if (!video) {
+        card.className = 'card placeholder';
+        card.textContent = `#${idx + 1} 加载中...`;
+        return card;
+      }
+      card.className = 'card';
+      const sources = [
+        video.has_mp4 ? '<span class="badge">MP4</span>' : '',
+        video.has_hls ? '<span class="badge">HLS</span>' : '',
+      ].join('');
+      card.innerHTML = `
+        <div class="card-title">${escapeHtml(video.title || '未命名视频')}</div>
+        <div class="card-meta">ID：${video.id != null ? escapeHtml(video.id) : '-'}</div>
+        <div class="card-meta">标签：${escapeHtml(formatTags(video.tags))}</div>
+        <div class="card-meta">时长：${escapeHtml(video.duration_hms || '未知')}</div>
+        <div class="card-meta">可用流：${sources || '暂无'}</div>
+        <div class="card-actions">
+          ${video.detail_url ? `<button class="secondary" onclick="openDetail('${escapeHtml(video.detail_url)}')">原站页面</button>` : ''}
+          <button class="primary" onclick="showVideoJson(${idx})">详情(JSON)</button>
+        </div>
+      `;
+      return card;
+    }
+
     function openDetail(url) {
       if (url) window.open(url, '_blank');
     }
 
-    function showVideoJson(index) {
-      const video = state.videos[index];
-      if (!video) return;
-      const modal = document.getElementById('detail-modal');
-      document.getElementById('detail-title').textContent = video.title || '视频详情';
-      document.getElementById('detail-json').textContent = JSON.stringify(video, null, 2);
-      modal.classList.remove('hidden');
+    async function showVideoJson(index) {
+      const id = state.resultId;
+      if (!id) return;
+      const title = document.getElementById('detail-title');
+      const body = document.getElementById('detail-json');
+      title.textContent = '视频详情';
+      body.textContent = '加载中...';
+      document.getElementById('detail-modal').classList.remove('hidden');
+      try {
+        const res = await fetch(`/api/results/${id}/${index}`);
+        const data = await res.json();
+        if (!res.ok) {
+          body.textContent = data.message || '加载失败';
+          return;
+        }
+        title.textContent = data.title || '视频详情';
+        body.textContent = JSON.stringify(data, null, 2);
+      } catch (error) {
+        body.textContent = '加载失败：' + error;
+      }
     }
 
     function closeModal() {
@@ -394,6 +584,8 @@ INDEX_HTML = """
         closeModal();
       }
     });
+    document.getElementById('videos').addEventListener('scroll', scheduleRender, { passive: true });
+    window.addEventListener('resize', scheduleRender);
     window.addEventListener('keydown', (evt) => {
       if (evt.key === 'Escape') {
         closeModal();
@@ -403,28 +595,43 @@ INDEX_HTML = """
 </body>
 </html>
 """
+# 首页不含模板变量，启动时编码一次，gzip / br 版本在首次请求时压缩并缓存
+INDEX_BODY = CachedBody(INDEX_HTML.encode("utf-8"), "text/html")
+_CATEGORY_BODY: Optional[Tuple[List[Category], CachedBody]] = None
 
 def create_client(data: Dict[str, Any]) -> MaomiClient:
     username = (data.get("username") or "").strip()
     password = (data.get("password") or "").strip()
-    return MaomiClient(username, password)
+    return MaomiClient(
+        username,
+        password,
+        token_store=TOKEN_STORE,
+        catalog=CATALOG,
+        response_cache=RESPONSE_CACHE,
+        metrics=METRICS,
+        breaker=BREAKER,
+    )
 
 @app.get("/")
-def index() -> str:
-    return render_template_string(INDEX_HTML)
+def index() -> Response:
+    return INDEX_BODY.response()
 
-@app.post("/api/categories")
+@app.route("/api/categories", methods=["GET", "POST"])
 def api_categories():
+    """GET 匿名返回分类目录，支持 If-None-Match 条件请求；POST 可附带账号密码，先校验登录。"""
     try:
-        payload = request.json or {}
-        username = (payload.get("username") or "").strip()
-        password = (payload.get("password") or "").strip()
-        if username and password:
-            client = MaomiClient(username, password)
+        client = create_client(request.get_json(silent=True) or {})
+        if client.username and client.password:
             client.login()
-        else:
-            client = MaomiClient("", "")
-        categories = client.fetch_categories()
+        return category_body(client.fetch_categories()).response()
+    except Exception as exc:  # noqa: BLE001
+        return jsonify({"message": str(exc)}), 400
+
+def category_body(categories: List[Category]) -> CachedBody:
+    """目录对象未变（CATALOG 未刷新）时复用上次的序列化、ETag 与压缩结果。"""
+    global _CATEGORY_BODY
+    cached = _CATEGORY_BODY
+    if cached is None or cached[0] is not categories:
         data = [
             {
                 "section": cat.section,
@@ -432,54 +639,55 @@ def api_categories():
                 "jump_name": cat.slug,
                 "channel": cat.channel,
                 "topic_id": cat.topic_id,
-                "supported": cat.channel in SUPPORTED_CHANNELS or cat.channel == "topic",
+                "supported": is_supported(cat),
             }
             for cat in categories
         ]
-        return jsonify(data)
-    except Exception as exc:  # noqa: BLE001
-        return jsonify({"message": str(exc)}), 400
+        cached = _CATEGORY_BODY = (categories, CachedBody(json_dumps(data), "application/json"))
+    return cached[1]
+
+def prepare_scrape(payload: Dict[str, Any]) -> Tuple[MaomiClient, Optional[LoginResult], Category, int]:
+    pages = max(1, int(payload.get("pages") or 1))
+    category = (payload.get("category") or "").strip()
+    if not category:
+        raise ValueError("category 不能为空")
+    client = create_client(payload)
+    login_res: Optional[LoginResult] = None
+    if client.username and client.password:
+        login_res = client.login()
+    matches = client.find_categories(category)
+    if not matches:
+        raise ValueError(f"未找到分类：{category}")
+    return client, login_res, matches[0], pages
+
+def account_payload(login_res: Optional[LoginResult]) -> Dict[str, Any]:
+    if not login_res:
+        return {"vip_level": None, "is_vip": None}
+    return {
+        "vip_level": login_res.raw.get("vip_level"),
+        "is_vip": login_res.raw.get("is_vip"),
+    }
+
+def category_payload(target: Category, pages: int) -> Dict[str, Any]:
+    return {
+        "section": target.section,
+        "name": target.name,
+        "jump_name": target.slug,
+        "channel": target.channel,
+        "pages_requested": pages,
+    }
 
 @app.post("/api/scrape")
 def api_scrape():
     try:
-        payload = request.json or {}
-        pages = max(1, int(payload.get("pages") or 1))
-        category = (payload.get("category") or "").strip()
-        if not category:
-            raise ValueError("category 不能为空")
-        username = (payload.get("username") or "").strip()
-        password = (payload.get("password") or "").strip()
-        client = MaomiClient(username, password)
-        login_res: Optional[LoginResult] = None
-        if username and password:
-            login_res = client.login()
-        categories = client.fetch_categories()
-        identifier = category.lower()
-        matches = [
-            cat for cat in categories if cat.slug.lower() == identifier or cat.name.lower() == identifier
-        ]
-        if not matches:
-            raise ValueError(f"未找到分类：{category}")
-        target = matches[0]
+        client, login_res, target, pages = prepare_scrape(request.json or {})
         videos, topic_meta = client.fetch_videos_for_category(target, pages)
-        account_data = (
-            {
-                "vip_level": login_res.raw.get("vip_level"),
-                "is_vip": login_res.raw.get("is_vip"),
-            }
-            if login_res
-            else {"vip_level": None, "is_vip": None}
-        )
+        SEARCH_INDEX.add(videos)
         return jsonify(
             {
-                "account": account_data,
+                "account": account_payload(login_res),
                 "category": {
-                    "section": target.section,
-                    "name": target.name,
-                    "jump_name": target.slug,
-                    "channel": target.channel,
-                    "pages_requested": pages,
+                    **category_payload(target, pages),
                     "videos_found": len(videos),
                     "topic_meta": topic_meta,
                 },
@@ -489,6 +697,185 @@ def api_scrape():
     except Exception as exc:  # noqa: BLE001
         return jsonify({"message": str(exc)}), 400
 
+@app.post("/api/scrape/stream")
+def api_scrape_stream():
+    """NDJSON 流式采集：依次推送 start、每页 page、最终 done（或 error）事件。"""
+    try:
+        client, login_res, target, pages = prepare_scrape(request.json or {})
+    except Exception as exc:  # noqa: BLE001
+        return jsonify({"message": str(exc)}), 400
+
+    def generate() -> Iterator[str]:
+        yield ndjson_line(
+            {"event": "start", "account": account_payload(login_res), "category": category_payload(target, pages)}
+        )
+        found = 0
+        topic_meta: Optional[Dict[str, Any]] = None
+        try:
+            for page in client.iter_pages(target, pages):
+                found += len(page.videos)
+                topic_meta = page.topic_meta
+                SEARCH_INDEX.add(page.videos)
+                yield ndjson_line(
+                    {
+                        "event": "page",
+                        "page": page.page,
+                        "last_page": min(pages, page.last_page),
+                        "videos": [video.to_dict() for video in page.videos],
+                        "videos_found": found,
+                        "topic_meta": topic_meta,
+                    }
+                )
+        except Exception as exc:  # noqa: BLE001
+            yield ndjson_line({"event": "error", "message": str(exc), "videos_found": found})
+            return
+        yield ndjson_line({"event": "done", "videos_found": found, "topic_meta": topic_meta})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/api/jobs")
+def api_create_job():
+    """提交后台采集任务，立即返回任务 id；同一账号（或均为匿名）、同分类同页数的任务共用一份结果。"""
+    try:
+        payload = request.json or {}
+        pages = max(1, int(payload.get("pages") or 1))
+        category = (payload.get("category") or "").strip()
+        if not category:
+            raise ValueError("category 不能为空")
+        client = create_client(payload)
+        matches = client.find_categories(category)
+        if not matches:
+            raise ValueError(f"未找到分类：{category}")
+        target = matches[0]
+    except Exception as exc:  # noqa: BLE001
+        return jsonify({"message": str(exc)}), 400
+
+    def run(job: Job) -> None:
+        if client.username and client.password:
+            client.login()
+        for page in client.iter_pages(target, pages):
+            job.add_page(page, pages)
+            SEARCH_INDEX.add(page.videos)
+
+    # 去重键带上凭据指纹：凭据错误的请求不会拿到别人的结果，VIP 与非 VIP 账号也不共用结果
+    account = None
+    if client.username and client.password:
+        account = credential_fingerprint(client.username, client.password)
+    job, created = JOBS.submit((account, target.channel, target.slug, pages), run, category_payload(target, pages))
+    return jsonify({"id": job.id, "status": job.status, "deduplicated": not created}), 202 if created else 200
+
+@app.get("/api/jobs/<job_id>")
+def api_get_job(job_id: str):
+    """任务进度与分页结果：?offset=0&limit=100，运行中返回已采到的部分。"""
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"message": "任务不存在或已过期"}), 404
+    try:
+        offset = int(request.args.get("offset") or 0)
+        limit = int(request.args.get("limit") or 100)
+    except ValueError:
+        return jsonify({"message": "offset / limit 必须为整数"}), 400
+    return jsonify(job.snapshot(offset, limit))
+
+@app.get("/api/results/<job_id>")
+def api_results(job_id: str):
+    """任务结果的卡片摘要：?offset=0&limit=200，供前端虚拟列表按块加载。"""
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"message": "任务不存在或已过期"}), 404
+    try:
+        offset = int(request.args.get("offset") or 0)
+        limit = int(request.args.get("limit") or 100)
+    except ValueError:
+        return jsonify({"message": "offset / limit 必须为整数"}), 400
+    total, window = job.window(offset, limit)
+    start = max(0, offset)
+    return jsonify(
+        {
+            "id": job.id,
+            "status": job.status,
+            "total": total,
+            "offset": start,
+            "videos": [result_card(video, start + idx) for idx, video in enumerate(window)],
+        }
+    )
+
+@app.get("/api/results/<job_id>/<int:index>")
+def api_result_detail(job_id: str, index: int):
+    """单条视频的完整记录，详情弹窗打开时才请求。"""
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"message": "任务不存在或已过期"}), 404
+    video = job.video_at(index)
+    if video is None:
+        return jsonify({"message": f"第 {index} 条结果不存在"}), 404
+    return jsonify(video.to_dict())
+
+def result_card(video: Video, index: int) -> Dict[str, Any]:
+    return {
+        "index": index,
+        "id": video.id,
+        "title": video.title,
+        "tags": video.tags,
+        "duration_hms": video.duration_hms,
+        "detail_url": video.detail_url,
+        "has_mp4": bool(video.down_path),
+        "has_hls": bool(video.video_path),
+    }
+
+@app.get("/api/jobs/<job_id>/export")
+def api_export_job(job_id: str):
+    """下载已完成任务的视频：?format=jsonl.gz，可选 jsonl / jsonl.zst / csv / csv.gz / parquet，分批流式编码。"""
+    fmt = request.args.get("format") or "jsonl.gz"
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"message": f"不支持的导出格式：{fmt}（可选 {', '.join(EXPORT_FORMATS)}）"}), 400
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"message": "任务不存在或已过期"}), 404
+    if job.status != JOB_DONE:
+        return jsonify({"message": f"任务尚未完成（{job.status}），完成后再导出"}), 409
+    filename = f"maomi-{job.info.get('jump_name') or 'videos'}-{job.id[:8]}.{fmt}"
+    return Response(
+        stream_with_context(iter_export(job.videos, fmt)),
+        mimetype=EXPORT_CONTENT_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@app.get("/api/search")
+def api_search():
+    """本地检索：?q=关键词&tags=a,b&min_duration=&max_duration=&offset=0&limit=20，时长单位为秒。"""
+    args = request.args
+    try:
+        min_duration = float(args["min_duration"]) if args.get("min_duration") else None
+        max_duration = float(args["max_duration"]) if args.get("max_duration") else None
+        offset = int(args.get("offset") or 0)
+        limit = int(args.get("limit") or DEFAULT_SEARCH_LIMIT)
+    except ValueError:
+        return jsonify({"message": "offset / limit 必须为整数，min_duration / max_duration 必须为数字"}), 400
+    result = timed_search(
+        SEARCH_INDEX,
+        query=args.get("q") or "",
+        tags=[tag for tag in (args.get("tags") or "").split(",") if tag.strip()],
+        min_duration=min_duration,
+        max_duration=max_duration,
+        offset=offset,
+        limit=limit,
+    )
+    return jsonify({"indexed": len(SEARCH_INDEX), "offset": max(0, offset), **result})
+
+@app.get("/metrics")
+def metrics():
+    if METRICS is None:
+        return Response("metrics disabled; set MAOMI_METRICS=1\n", status=404, mimetype="text/plain")
+    return Response(METRICS.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+def ndjson_line(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
 def run(host: str = "0.0.0.0", port: int = 5000) -> None:
     app.run(host=host, port=port, debug=False)
 